@@ -118,18 +118,22 @@ class EventKitRemindersService:
 
     def _convert_reminder_to_dict(self, reminder: EKReminder) -> Dict:
         """Convert an EKReminder object to our standard dictionary format."""
+        # Every accessor is an Objective-C message send, so each is made once
+        notes = reminder.notes()
+        priority = reminder.priority()
+        calendar = reminder.calendar()
         result = {
-            'guid': str(reminder.calendarItemIdentifier()),
-            'title': str(reminder.title()),
-            'desc': str(reminder.notes()) if reminder.notes() else '',
-            'completed': bool(reminder.completed()),
-            'collection': str(reminder.calendar().title()),
-            'priority': int(reminder.priority()) if reminder.priority() else 0,
-            'p_guid': str(reminder.calendar().calendarIdentifier())
+            "guid": str(reminder.calendarItemIdentifier()),
+            "title": str(reminder.title()),
+            "desc": str(notes) if notes else "",
+            "completed": bool(reminder.completed()),
+            "collection": str(calendar.title()),
+            "priority": int(priority) if priority else 0,
+            "p_guid": str(calendar.calendarIdentifier()),
         }
 
-        if reminder.dueDateComponents():
-            components = reminder.dueDateComponents()
+        components = reminder.dueDateComponents()
+        if components:
             calendar = NSCalendar.currentCalendar()
             # Set the calendar's timezone to UTC for consistent handling
             calendar.setTimeZone_(NSTimeZone.timeZoneWithName_("UTC"))
@@ -1,21 +1,529 @@
 """Notes service."""
+import asyncio
 from datetime import datetime
 import logging
+import os
 import re
+import sys
+import threading
 import uuid
-from typing import List, Dict, Optional, Union, Any
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union, Any
 import json
+import random
 import time
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests import RequestException
+from requests.exceptions import ChunkedEncodingError
+from requests.adapters import HTTPAdapter
 from tzlocal import get_localzone_name
 import pytz
 from pyicloud.exceptions import PyiCloudException, PyiCloudAPIResponseException
+from pyicloud.utils import SlottedRecord
+
+try:
+    import numba
+    import numpy as np
+except ImportError:  # Optional accelerator for the local search fallback
+    numba = None
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON codec
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # Optional async transport for arefresh()
+    httpx = None
+
+try:
+    import ijson
+except ImportError:  # Optional incremental parser for the /no/startup body
+    ijson = None
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Exceptions a notes request is retried on
+_RETRYABLE_ERRORS = (RequestException, PyiCloudAPIResponseException) + (
+    (httpx.HTTPError,) if httpx is not None else ()
+)
+
 REQUEST_TIMEOUT = 30
 BATCH_SIZE = 50
+MAX_WORKERS = 8
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+_BACKOFF_BASE = 0.25  # Seconds
+_BACKOFF_CAP = 4.0  # Seconds
+_FREE_THROTTLE_RETRIES = 2  # 429/503 answers per request that do not use up a retry
+_RETRY_AFTER_CAP = 5.0  # Seconds
+_MAX_AUTH_REFRESHES = 1  # Auth refreshes per request before an auth failure is final
+_AUTH_REFRESH_WINDOW = 5.0  # Seconds an auth refresh satisfies other failed requests
+_GET_TTL = 2.0  # Seconds a GET response is served from memory
+_GET_CACHE_SIZE = 64
+_SEARCH_CACHE_SIZE = 128
+SEARCH_LIMIT = 100
+NOTE_MAX_AGE = 60.0  # Seconds get_note() serves a fetched note from the cache
+ASYNC_MAX_CONNECTIONS = 16
+
+# HTML wrapper Notes expects around a plain-text body
+_HTML_PREFIX = (
+    '<html><head><meta charset="UTF-8"><meta name="apple-notes-version" content="3.0">'
+    '<meta name="apple-notes-editable" content="true"></head>'
+    '<body style="word-wrap: break-word; -webkit-nbsp-mode: space; -webkit-line-break: after-white-space;">'
+)
+_HTML_SUFFIX = "</body></html>"
+_SCHEMA = "chunked:3"
+# Sent with every JSON body; _cloudKitVersion is always 2
+_BODY_BASE = {"_cloudKitVersion": "2", "schema": _SCHEMA}
+_LOCAL_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"  # Local modification times sent to Notes
+
+
+def _wrap_html(body: str) -> str:
+    """Wrap a note body in the HTML document Notes expects."""
+    return "".join((_HTML_PREFIX, body, _HTML_SUFFIX))
+
+
+def _backoff(previous: float) -> float:
+    """Return the next backoff delay, with decorrelated jitter from the previous one."""
+    return min(_BACKOFF_CAP, random.uniform(_BACKOFF_BASE, previous * 3))
+
+
+def _retry_after(response, previous: float) -> float:
+    """Return how long to wait before retrying a 429 or 503, honouring a capped Retry-After."""
+    value = response.headers.get("Retry-After")
+    if value is not None:
+        try:
+            return min(float(value), _RETRY_AFTER_CAP)
+        except ValueError:  # HTTP-date form, fall back to our own backoff
+            pass
+    return _backoff(previous)
+
+
+# (epoch second, its formatted UTC date and time), replaced as a whole
+_utc_second = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO 8601 string with milliseconds."""
+    global _utc_second
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _utc_second
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _utc_second = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}Z"
+
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _tokens(text: str) -> List[str]:
+    """Split text into case-folded word tokens."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _index_tokens(note_data) -> set:
+    """Return the words of a cached note's case-folded title and tags."""
+    findall = _TOKEN_RE.findall
+    return set(findall(note_data.get("_title_lc", ""))).union(
+        *map(findall, note_data.get("_tags_lc", ()))
+    )
+
+
+# (note key, server key, fallback server key or None, default) for server notes
+_FIELDS = (
+    ("guid", "identifier", "noteGuid", None),
+    ("title", "title", "subject", ""),
+    ("size", "contentLength", "size", 0),
+    ("modified", "lastModifiedDate", None, None),
+    ("content", "content", None, None),
+    ("created", "createdDate", None, None),
+    ("isShared", "isShared", None, False),
+    ("hasAttachments", "hasAttachments", None, False),
+    ("format", "format", None, "html"),
+    ("encoding", "encoding", None, "UTF-8"),
+    ("status", "status", None, "active"),
+    ("version", "version", None, 1),
+)
+
+
+def _extract(note: Dict, fields=_FIELDS) -> Dict:
+    """Map a note from a server response onto the cached field names."""
+    get = note.get
+    return {
+        key: get(primary, default)
+        if fallback is None
+        else (get(primary) or get(fallback, default))
+        for key, primary, fallback, default in fields
+    }
+
+
+def _search_result(note) -> Dict:
+    """Return a cached note in the shape of a /no/search result."""
+    fields = {key: note.get(key, default) for key, _, _, default in _FIELDS}
+    fields["folder"] = note.get("folder") or note.get("folderName", "/")
+    fields["tags"] = list(note.get("tags") or ())
+    return fields
+
+
+def _note_with_body(note: "Note") -> Dict:
+    """Return a copy of a cached note with its plain-text body and collection added."""
+    fields = note.to_dict()
+    fields["body"] = re.sub("<[^<]+?>", "", fields.get("content") or "").strip()
+    # Ensure the note data includes the expected "collection" key
+    fields["collection"] = fields.get("folderName", "/")
+    return fields
+
+
+def _copy_results(results: List[Dict]) -> List[Dict]:
+    """Copy search results, tag lists included, so no caller shares the cached ones."""
+    return [{**note, "tags": list(note["tags"] or ())} for note in results]
+
+
+def _folder_entry(folder: Dict) -> Tuple[str, Dict]:
+    """Map a folder from a /no/startup response onto its interned name and cached fields."""
+    get = folder.get
+    folder_name = sys.intern(get("name") or get("folderName") or "/")
+    return folder_name, {
+        "guid": get("identifier") or get("folderId") or f"folder_{folder_name}",
+        "ctag": get("serverCtag") or get("etag", ""),
+        "type": "folder",
+        "parentId": get("parentIdentifier") or get("parentId", "root"),
+        "order": get("sortOrder") or get("order", 0),
+        "version": get("version", 1),
+        "isShared": get("isShared", False),
+    }
+
+
+def _iter_startup_items(stream) -> Iterator[Tuple[str, Any]]:
+    """Incrementally parse a /no/startup body into its top-level fields.
+
+    Yields (key, value) for each top-level field, except that every entry of
+    the notes array is yielded on its own as ("notes.item", note) as soon as
+    it has been parsed.
+    """
+    builder = None
+    target = key = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == target and event in ("end_map", "end_array"):
+                yield key, builder.value
+                builder = None
+            continue
+        if prefix == "notes.item":
+            key = prefix
+        elif prefix and "." not in prefix and prefix != "notes":
+            key = prefix
+        else:
+            continue
+        if event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            target = prefix
+        elif event != "map_key":
+            yield key, value
+
+
+def _read_startup_items(response) -> List[Tuple[str, Any]]:
+    """Parse a streamed /no/startup body into its top-level fields and release the connection.
+
+    A body that ends early raises ChunkedEncodingError, as requests does when
+    it reads a body itself, so the request is retried.
+    """
+    parsed = False
+    try:
+        response.raw.decode_content = True
+        items = list(_iter_startup_items(response.raw))
+        parsed = True
+    except ijson.IncompleteJSONError as e:
+        raise ChunkedEncodingError(f"Incomplete /no/startup body: {e}") from e
+    finally:
+        if parsed and hasattr(response.raw, "drain_conn"):
+            # The body was read outside requests, so close() would drop the socket
+            response.raw.drain_conn()
+        else:
+            response.close()
+    return items
+
+
+def _split_mutation_response(
+    response: Optional[Dict], entries: List[Dict]
+) -> List[Optional[Dict]]:
+    """Give each note change of a batched /no/content POST its own view of the response."""
+    notes = response.get("notes") if response else None
+    if len(entries) == 1 or not isinstance(notes, list):
+        return [response] * len(entries)
+    by_id = {}
+    for note in notes:
+        by_id[note.get("identifier")] = note
+        by_id[note.get("noteGuid")] = note
+    results = []
+    for position, entry in enumerate(entries):
+        note = by_id.get(entry.get("identifier")) or by_id.get(entry.get("noteGuid"))
+        if note is None and position < len(notes):
+            note = notes[position]
+        results.append({**response, "notes": [note] if note is not None else []})
+    return results
+
+
+if orjson is not None:
+    _jdumps = orjson.dumps
+    _jparse = orjson.loads
+
+    def _jloads(response) -> Any:
+        """Decode a JSON response straight from its body bytes."""
+        return orjson.loads(response.content)
+
+else:
+    # Compact UTF-8 output, byte-compatible with what orjson produces
+    _encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def _jdumps(obj) -> bytes:
+        """Serialize a request body to UTF-8 JSON bytes."""
+        return _encode(obj).encode("utf-8")
+
+    _decode = json.JSONDecoder().decode
+
+    def _jparse(data: bytes) -> Any:
+        """Decode UTF-8 JSON bytes with a shared decoder."""
+        return _decode(data.decode("utf-8"))
+
+    def _jloads(response) -> Any:
+        """Decode a JSON response with a shared decoder."""
+        return _jparse(response.content)
+
+
+if numba is not None:
+    # Not parallel=True: numba's workqueue pool started off the main thread hangs interpreter exit
+    @numba.njit(cache=True)
+    def _scan(buf, offsets, pattern, rows):
+        """Return a bool per note telling whether pattern occurs in its slice of buf.
+
+        Only notes still set in rows are scanned, so later needles skip the
+        notes an earlier one already ruled out.
+        """
+        size = pattern.shape[0]
+        if size == 0:
+            return rows.copy()
+        count = offsets.shape[0] - 1
+        first = pattern[0]
+        final = pattern[size - 1]
+        hits = np.zeros(count, dtype=np.bool_)
+        for i in range(count):
+            if not rows[i]:
+                continue
+            pos = offsets[i]
+            last = offsets[i + 1] - size
+            while pos <= last:
+                # Compare the end bytes first; most candidates fail there
+                if buf[pos] == first and buf[pos + size - 1] == final:
+                    k = 1
+                    while k < size - 1 and buf[pos + k] == pattern[k]:
+                        k += 1
+                    if k >= size - 1:
+                        hits[i] = True
+                        break
+                pos += 1
+        return hits
+
+
+_MISSING = object()
+_EMPTY = {}  # Shared stand-in for an absent nested object; never mutated
+
+
+class Note(SlottedRecord):
+    """A cached note, with its common fields kept in slots, e.g. ``note.guid``.
+
+    Only the service's caches hold these; the getters return ``to_dict()``
+    copies.
+    """
+
+    # Note key -> slot name
+    _SLOTS = {
+        "guid": "guid",
+        "title": "title",
+        "_title_lc": "title_lc",
+        "content": "content",
+        "_content_lc": "content_lc",
+        "folder": "folder",
+        "size": "size",
+        "modified": "modified",
+        "tags": "tags",
+        "_tags_lc": "tags_lc",
+        "created": "created",
+        "isShared": "is_shared",
+        "hasAttachments": "has_attachments",
+        "format": "format",
+        "encoding": "encoding",
+        "status": "status",
+        "version": "version",
+        "_fetched_at": "fetched_at",
+    }
+
+    __slots__ = tuple(_SLOTS.values())
+
+
+class _NotesTable:
+    """Column-oriented snapshot of the cached notes used for bulk scans.
+
+    The per-note dicts stay the canonical cache; this keeps parallel
+    columns of the fields the local search reads so a scan walks a few
+    flat lists instead of one dict per note.
+    """
+
+    __slots__ = (
+        "guids",
+        "titles_lc",
+        "contents_lc",
+        "tags",
+        "_blobs",
+        "_buffer",
+        "_offsets",
+    )
+
+    def __init__(self, notes_by_guid: Dict[str, Dict]):
+        self.guids = []
+        self.titles_lc = []
+        self.contents_lc = []
+        self.tags = []
+        for guid, note in notes_by_guid.items():
+            self.guids.append(guid)
+            self.titles_lc.append(note.get("_title_lc", ""))
+            self.contents_lc.append(note.get("_content_lc", ""))
+            self.tags.append(note.get("_tags_lc", frozenset()))
+        self._blobs = None
+        self._buffer = None
+        self._offsets = None
+
+    def __len__(self) -> int:
+        return len(self.guids)
+
+    def _join(self) -> List[str]:
+        """Join each row's case-folded title, content and tags into one string."""
+        if self._blobs is None:
+            self._blobs = [
+                "\x00".join((title, content, *tags))
+                for title, content, tags in zip(
+                    self.titles_lc, self.contents_lc, self.tags
+                )
+            ]
+        return self._blobs
+
+    def _pack(self):
+        """Pack each row's case-folded title, content and tags into one byte buffer."""
+        chunks = []
+        offsets = np.zeros(len(self.guids) + 1, dtype=np.int32)
+        position = 0
+        for row, blob in enumerate(self._join()):
+            chunk = blob.encode("utf-8") + b"\x00"
+            chunks.append(chunk)
+            position += len(chunk)
+            offsets[row + 1] = position
+        self._buffer = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+        self._offsets = offsets
+
+    def match(self, needles: List[str]) -> List[int]:
+        """Return the rows whose title, content or tags contain every case-folded needle."""
+        if numba is not None:
+            if self._buffer is None:
+                self._pack()
+            hits = np.ones(len(self.guids), dtype=np.bool_)
+            for needle in needles:
+                pattern = np.frombuffer(needle.encode("utf-8"), dtype=np.uint8)
+                hits = _scan(self._buffer, self._offsets, pattern, hits)
+            return np.flatnonzero(hits).tolist()
+        # One substring search per needle over the joined row rather than
+        # one per field and tag; a NUL never appears in a needle, so no hit
+        # can straddle two fields.
+        return [
+            row
+            for row, blob in enumerate(self._join())
+            if all(needle in blob for needle in needles)
+        ]
+
+
+class _NotesAdapter(HTTPAdapter):
+    """Connection pool for the notes host that also adds its static CloudKit headers.
+
+    The session is shared with the other services, which set their own
+    values for some of these headers, so they are applied here, after the
+    session headers were merged in, rather than on the session.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["static_headers"]
+
+    def __init__(self, *args, **kwargs):
+        self.static_headers = {}
+        super().__init__(*args, **kwargs)
+
+    def add_headers(self, request, **kwargs):
+        """Overlay the static notes headers on a request about to be sent."""
+        request.headers.update(self.static_headers)
+
+
+class _Coalescer:
+    """Merges calls that arrive while an earlier one is in flight into one batch.
+
+    The first caller sends its item straight away. Items submitted while
+    that batch is in flight queue up and go out together, BATCH_SIZE at a
+    time, through send(items), which returns one result per item. Each
+    batch is sent by one of the waiting callers, which stops leading once
+    its own item has been sent.
+    """
+
+    __slots__ = ("_send", "_pending", "_cond", "_flushing")
+
+    def __init__(self, send: Callable[[List[Any]], List[Any]]):
+        self._send = send
+        self._pending = []  # (item, Future) waiting for the next batch
+        self._cond = threading.Condition()
+        self._flushing = False  # True while a thread is sending a batch
+
+    def submit(self, item: Any) -> Any:
+        """Queue an item and return its result once its batch has been sent."""
+        future = Future()
+        cond = self._cond
+        with cond:
+            self._pending.append((item, future))
+        while not future.done():
+            with cond:
+                while self._flushing and not future.done():
+                    cond.wait()
+                if future.done():
+                    break
+                self._flushing = True
+                batch = self._pending[:BATCH_SIZE]
+                del self._pending[:BATCH_SIZE]
+            try:
+                self._send_batch(batch)
+            finally:
+                with cond:
+                    self._flushing = False
+                    cond.notify_all()
+        return future.result()
+
+    def _send_batch(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Send one batch and resolve every future in it, whatever happens."""
+        try:
+            results = self._send([item for item, _ in batch])
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _, future in batch:
+                if not future.done():  # Short result list, or interrupted
+                    future.set_exception(
+                        NonRetryableError("No result for a batched call")
+                    )
+
 
 class NotesNotAvailable(Exception):
     """Raised when Notes service is not available."""
@@ -27,44 +535,106 @@ class NonRetryableError(Exception):
 
 class NotesService:
     """The 'Notes' iCloud service."""
-    
-    def __init__(self, session, service_root: str, params: dict = None, max_retries: int = 3):
-        """Initialize the Notes service."""
+
+    def __init__(
+        self,
+        session,
+        service_root: str,
+        params: dict = None,
+        max_retries: int = 3,
+        use_httpx: bool = False,
+        disk_cache: bool = False,
+    ):
+        """Initialize the Notes service.
+
+        With use_httpx, requests go through an httpx client (HTTP/2 when h2 is
+        installed) that shares the session's headers and cookies. With
+        disk_cache, the synced notes are kept next to the session cookies so
+        a new instance only has to fetch what changed since. This writes the
+        full contents of every note to disk, readable only by the current
+        user, so it is off by default.
+        """
         self.session = session
         self._service_root = service_root
         self._max_retries = max_retries
         self.collections = {}  # Folders by name
-        self.lists = defaultdict(list)  # Notes by GUID
+        self.lists = defaultdict(dict)  # Folder name -> {note GUID: note}
         self._notes_by_guid = {}  # Notes by GUID
-        self._tags = set()  # All unique tags
+        # Case-folded tag -> GUIDs of the notes carrying it
+        self._notes_by_tag = defaultdict(set)
+        # Word of a title or tag -> GUIDs of the notes containing it
+        self._notes_by_token = defaultdict(set)
+        self._tag_intern = {}  # Tag -> the single shared copy of that string
+        self._last_sync_token = (
+            None  # syncToken of the last /no/startup response applied
+        )
+        # GUIDs of notes merged without a body since the last body fetch
+        self._unfetched = []
+        self._notes_table = None  # Column snapshot of _notes_by_guid for local search
+        self._url_cache = {}  # Endpoint -> absolute URL
+        # (endpoint, params) -> (monotonic time, raw JSON bytes)
+        self._get_cache = OrderedDict()
+        self._get_cache_lock = threading.Lock()
+        # (query, limit) -> results, cleared whenever a note changes
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_generation = (
+            0  # Bumped on every clear so in-flight searches do not cache stale results
+        )
+        # Note changes sharing /no/content POSTs
+        self._mutations = _Coalescer(self._send_mutations)
+        # get_note() calls sharing /no/content POSTs
+        self._reads = _Coalescer(self._send_reads)
+        self._auth_lock = threading.Lock()  # Serializes notes auth refreshes
+        # Monotonic time of the last auth refresh
+        self._auth_refreshed_at = float("-inf")
+        self._tz_name = get_localzone_name()  # Resolved once; may read /etc/localtime
+        self._local_tz = pytz.timezone(self._tz_name)
         self._default_folder = "Notes"  # Default folder if none exists
+        self._disk_cache = disk_cache
+        self._pool = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="notes"
+        )
+        self._async = None  # httpx.AsyncClient, created on first async request
+        self._http = None  # httpx.Client replacing self.session for requests when use_httpx is set
+        if use_httpx:
+            if httpx is None:
+                raise PyiCloudException("httpx is required for use_httpx")
+            self._http = self._new_httpx_client(
+                httpx.Client,
+                httpx.Limits(
+                    max_keepalive_connections=POOL_CONNECTIONS,
+                    max_connections=POOL_MAXSIZE,
+                ),
+            )
+
+        # Keep enough pooled connections to the notes host for concurrent requests
+        self._adapter = _NotesAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            pool_block=False,
+            max_retries=getattr(session, "retry_strategy", 0),
+        )
+        self.session.mount(service_root, self._adapter)
 
         # Get web token from session
         web_token = session.service.data.get("dsInfo", {}).get("dsid")
         if not web_token:
             raise NotesNotAvailable("Failed to get web token")
 
-        # Extract host from service_root
-        host = service_root.split("://")[1].split(":")[0]
-
-        # Set up headers with consistent API versions
-        self.session.headers.update({
-            'X-Apple-Auth-Token': session.service.session_data.get('session_token'),
-            'X-Apple-Time-Zone': get_localzone_name(),
-            'X-Apple-CloudKit-Request-ISO8601Timestamp': datetime.utcnow().isoformat() + 'Z',
-            'X-Apple-CloudKit-Request-Context': 'notes',
-            'X-Apple-CloudKit-Request-Environment': 'production',
-            'X-Apple-CloudKit-Request-SigningVersion': '3',
-            'X-Apple-CloudKit-Request-KeyID': session.service.client_id,
-            'X-Apple-CloudKit-Request-Container': 'com.apple.notes',
-            'X-Apple-CloudKit-Request-Schema': 'chunked:3',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-            'Host': host,
-            'Origin': 'https://www.icloud.com',
-            'Referer': 'https://www.icloud.com/'
-        })
-        
+        # Refresh notes authentication only when the session has no token yet.
+        # A forced refresh clears the session headers, so it runs before they are set.
+        session_token = session.service.session_data.get("session_token")
+        if not session_token:
+            try:
+                session.service.authenticate(True, "notes")
+                self._auth_refreshed_at = time.monotonic()
+            except Exception as e:
+                logger.warning("Failed to refresh notes authentication: %s", e)
+            session_token = session.service.session_data.get("session_token")
+        if not session_token:
+            raise NotesNotAvailable("Failed to get session token")
+
         # Add service-specific parameters with consistent API versions
         self.params = {
             "clientBuildNumber": "4039.6.6",
@@ -72,173 +642,263 @@ class NotesService:
             "clientId": session.service.client_id,
             "dsid": session.service.data.get("dsInfo", {}).get("dsid"),
             "lang": "en-us",
-            "usertz": get_localzone_name(),
+            "usertz": self._tz_name,
             "notesWebUIVersion": "3.0",
             "_cloudKitVersion": "3",
             "requestID": str(uuid.uuid4()).upper(),
-            "schema": "chunked:3"
+            "schema": _SCHEMA,
         }
         if params:
             self.params.update(params)
-        
-        # Force authentication refresh for notes service
-        try:
-            session.service.authenticate(True, "notes")
-        except Exception as e:
-            logger.warning(f"Failed to refresh notes authentication: {e}")
-        
-        # Get web token from session
-        web_token = session.service.session_data.get("session_token")
-        if not web_token:
-            raise NotesNotAvailable("Failed to get session token")
+        # Base query of every request
+        self._request_params = {**self.params, "_cloudKitVersion": "2"}
 
-        # Update headers with correct iOS 13+ values
-        self.session.headers.update({
-            "X-Apple-I-Web-Token": web_token,
-            "X-Apple-Routing-Key": f"{self.params['dsid']}:0:notes",
-            "X-Apple-I-Protocol-Version": "1.0",
-            "X-Apple-I-TimeZone": get_localzone_name(),
-            "X-Apple-I-Client-Time": datetime.now().isoformat()
-        })
+        # Set up headers with consistent API versions and the iOS 13+ values
+        timestamp_z = _utc_timestamp()
+        self.session.headers.update(
+            {
+                "X-Apple-Auth-Token": session_token,
+                "X-Apple-Time-Zone": self._tz_name,
+                "X-Apple-CloudKit-Request-ISO8601Timestamp": timestamp_z,
+                "X-Apple-CloudKit-Request-Context": "notes",
+                "X-Apple-CloudKit-Request-Environment": "production",
+                "X-Apple-CloudKit-Request-SigningVersion": "3",
+                "X-Apple-CloudKit-Request-KeyID": session.service.client_id,
+                "X-Apple-CloudKit-Request-Container": "com.apple.notes",
+                "X-Apple-CloudKit-Request-Schema": _SCHEMA,
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+                "Connection": "keep-alive",
+                "Origin": "https://www.icloud.com",
+                "Referer": "https://www.icloud.com/",
+                "X-Apple-I-Web-Token": session_token,
+                "X-Apple-Routing-Key": f"{self.params['dsid']}:0:notes",
+                "X-Apple-I-Protocol-Version": "1.0",
+                "X-Apple-I-TimeZone": self._tz_name,
+                "X-Apple-I-Client-Time": timestamp_z,
+            }
+        )
+
+        self._static_headers = (
+            self._adapter.static_headers
+        ) = self._build_static_headers()
 
         # Initial refresh
         if not self.refresh():
             raise NotesNotAvailable("Failed to initialize notes service")
 
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
-                     params: Optional[Dict] = None, timeout: int = REQUEST_TIMEOUT) -> Optional[Any]:
+    def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> Optional[Any]:
         """Make an authenticated request with minimal retries."""
+        if method.lower() == "get":
+            return self._get_json(endpoint, params=params, timeout=timeout)
+        return self._post_json(endpoint, data, params=params, timeout=timeout)
+
+    def _get_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> Optional[Any]:
+        """GET an endpoint and return its JSON body."""
+        url, request_params, _ = self._prepare_request(endpoint, None, params)
+
+        # Serve repeat GETs from memory for a short while; any write invalidates.
+        # The raw body is kept, so every caller decodes its own copy to mutate.
+        cache_key = (
+            endpoint,
+            tuple(
+                sorted(
+                    (key, str(value))
+                    for key, value in request_params.items()
+                    if key != "requestID"
+                )
+            ),
+        )
+        with self._get_cache_lock:
+            cached = self._get_cache.get(cache_key)
+            if cached is not None:
+                if time.monotonic() - cached[0] < _GET_TTL:
+                    self._get_cache.move_to_end(cache_key)
+                    return _jparse(cached[1])
+                del self._get_cache[cache_key]
+
+        get = (self._http or self.session).get
+
+        def send(headers):
+            return get(url, params=request_params, timeout=timeout, headers=headers)
+
+        response = self._retry_loop(send, "GET", url, request_params, None, stream=True)
+        if response is None:
+            return None
+        content = response.content
+        body = _jparse(content)
+        if body is not None:
+            with self._get_cache_lock:
+                self._get_cache[cache_key] = (time.monotonic(), content)
+                if len(self._get_cache) > _GET_CACHE_SIZE:
+                    self._get_cache.popitem(last=False)
+        return body
+
+    def _get_stream(
+        self,
+        endpoint: str,
+        read: Callable,
+        params: Optional[Dict] = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> Optional[Any]:
+        """GET an endpoint and return what read() makes of the response's unread body."""
+        url, request_params, _ = self._prepare_request(endpoint, None, params)
+        get = self.session.get
+
+        def send(headers):
+            return get(
+                url,
+                params=request_params,
+                timeout=timeout,
+                headers=headers,
+                stream=True,
+            )
+
+        return self._retry_loop(
+            send, "GET", url, request_params, None, stream=True, read=read
+        )
+
+    def _post_json(
+        self,
+        endpoint: str,
+        data: Optional[Dict],
+        params: Optional[Dict] = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> Optional[Any]:
+        """POST a JSON body to an endpoint and return the JSON response."""
+        with self._get_cache_lock:
+            self._get_cache.clear()
+        url, request_params, data = self._prepare_request(endpoint, data, params)
+        post = (self._http or self.session).post
+        # httpx takes raw bytes as content=
+        body_arg = "content" if self._http is not None else "data"
+
+        def send(headers):
+            body = {body_arg: _jdumps(data)} if data is not None else {}
+            return post(
+                url, params=request_params, timeout=timeout, headers=headers, **body
+            )
+
+        return self._retry_loop(send, "POST", url, request_params, data)
+
+    def _retry_loop(
+        self,
+        send: Callable,
+        method: str,
+        url: str,
+        request_params: Dict,
+        data: Optional[Dict],
+        stream: bool = False,
+        read: Optional[Callable] = None,
+    ) -> Optional[Any]:
+        """Call send(headers) until it succeeds, refreshing auth and backing off between attempts.
+
+        Every attempt carries the requestID _prepare_request stamped, so the
+        server can recognise a retried write. With stream set, the successful
+        response is returned undecoded, or handed to read() so that a body
+        which fails while it is read is requested again.
+        """
         max_retries = self._max_retries
         retry_count = 0
+        throttled = 0
+        auth_refreshes = 0
+        delay = _BACKOFF_BASE
         last_error = None
-        
+        # Checked once instead of per log call
+        debug = logger.isEnabledFor(logging.DEBUG)
+
         while retry_count < max_retries:
             try:
-                logger.debug(f"Making {method} request to {endpoint}")
-                
-                # Generate a single requestID for both URL params and body
-                request_id = str(uuid.uuid4()).upper()
-                
-                # Get current time in correct format
-                now = datetime.utcnow()
-                timestamp_z = now.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'  # Truncate microseconds to 3 digits
-                
-                # Start with base params and ensure consistency
-                request_params = {
-                    **self.params,
-                    "requestID": request_id,  # Use the same requestID
-                    "_cloudKitVersion": "2"  # Ensure this is always 2
-                }
-                if params:
-                    request_params.update(params)
-                    request_params["requestID"] = request_id  # Ensure it's not overwritten
-                
-                # Ensure data consistency
-                if data and isinstance(data, dict):
-                    data = {**data}  # Make a copy to avoid modifying the original
-                    data["_cloudKitVersion"] = "2"  # Ensure this is always 2
-                    data["requestID"] = request_id  # Use the same requestID
-                    data["schema"] = "chunked:3"
-                
-                # Add required headers with consistent timestamps
-                headers = {
-                    'X-Apple-Web-Token': self.session.service.session_data.get('session_token'),
-                    'X-Apple-Time-Zone': get_localzone_name(),
-                    'X-Apple-CloudKit-Request-ISO8601Timestamp': timestamp_z,
-                    'X-Apple-CloudKit-Request-Context': 'notes',
-                    'X-Apple-CloudKit-Request-Environment': 'production',
-                    'X-Apple-CloudKit-Request-SigningVersion': '3',
-                    'X-Apple-CloudKit-Request-KeyID': self.session.service.client_id,
-                    'X-Apple-CloudKit-Request-Container': 'com.apple.notes',
-                    'X-Apple-CloudKit-Request-Schema': 'chunked:3',
-                    'X-Apple-I-ClientTime': timestamp_z,  # Use same format
-                    'Host': self._service_root.split("://")[1].split(":")[0],
-                    'X-Apple-I-Web-Token': self.session.service.session_data.get('session_token'),
-                    'X-Apple-Routing-Key': f"{self.params['dsid']}:0:notes",
-                    'X-Apple-I-Protocol-Version': "2.0",  # Match CloudKit version
-                    'Accept': 'application/json',
-                    'Content-Type': 'application/json',
-                    'Origin': 'https://www.icloud.com',
-                    'Referer': 'https://www.icloud.com/'
-                }
-                
-                url = endpoint if endpoint.startswith('http') else f"{self._service_root}{endpoint}"
-                logger.debug(f"Request URL: {url}")
-                logger.debug(f"Request params: {request_params}")
-                logger.debug(f"Request headers: {headers}")
-                
-                logger.debug("Making request - URL: %s, method: %s, params: %s, data: %s", 
-                           url, method, request_params, data)
-                logger.debug("Request headers: %s", headers)
-                logger.debug("Auth token: %s", self.session.service.session_data.get("session_token"))
+                headers = self._request_headers(static=self._http is not None)
 
-                if method.lower() == 'get':
-                    response = self.session.get(
+                if debug:
+                    logger.debug(
+                        "Making %s request to %s, params: %s",
+                        method,
                         url,
-                        params=request_params,
-                        timeout=timeout,
-                        headers=headers
+                        request_params,
                     )
-                else:
-                    response = self.session.post(
-                        url,
-                        json=data,  # Ensure JSON encoding
-                        params=request_params,
-                        timeout=timeout,
-                        headers=headers
-                    )
-                
-                logger.debug("Response status: %d", response.status_code)
-                logger.debug(f"Response headers: {response.headers}")
-                logger.debug(f"Response body: {response.text}")
-                
+
+                response = send(headers)
+
+                if debug:
+                    logger.debug("Response status: %d", response.status_code)
+
                 # Handle different error cases
-                if response.status_code == 401:
-                    logger.debug("Got 401, attempting auth refresh")
-                    self.session.service.authenticate(True, "notes")
-                    retry_count += 1
-                    continue
-                    
-                elif response.status_code == 500 and "Authentication required" in response.text:
-                    logger.debug("Got auth required error, attempting auth refresh")
-                    self.session.service.authenticate(True, "notes")
-                    retry_count += 1
-                    continue
-                    
-                elif response.status_code == 503:
-                    # Service unavailable - retry with backoff
-                    retry_after = min(int(response.headers.get('Retry-After', 2)), 5)  # Cap at 5 seconds
-                    logger.warning("Got 503, waiting %d seconds before retry", retry_after)
-                    time.sleep(retry_after)
-                    retry_count += 1
-                    continue
-                    
-                elif response.status_code == 450:  # Notes-specific auth failures
-                    logger.debug("Notes-specific auth failure, refreshing...")
-                    self.session.service.authenticate(
-                        force_refresh=True,
-                        service='notes'
+                if response.status_code in (401, 450) or (
+                    response.status_code == 500
+                    and "Authentication required" in response.text
+                ):
+                    # Auth failure, including the Notes-specific 450 - refresh once per request
+                    self._check_auth_refreshes(auth_refreshes, response)
+                    auth_refreshes += 1
+                    logger.debug(
+                        "Got %d, attempting auth refresh", response.status_code
                     )
+                    self._reauthenticate()
                     retry_count += 1
                     continue
-                    
+
+                elif response.status_code in (429, 503):
+                    # Throttled or unavailable - retry with backoff; the first few are free
+                    throttled += 1
+                    if throttled > _FREE_THROTTLE_RETRIES:
+                        retry_count += 1
+                    if retry_count < max_retries:
+                        delay = _retry_after(response, delay)
+                        logger.warning(
+                            "Got %d, waiting %.2f seconds before retry",
+                            response.status_code,
+                            delay,
+                        )
+                        time.sleep(delay)
+                    continue
+
                 elif response.status_code >= 400:
                     # Other errors - non-retryable
-                    logger.error("Got error status %d: %s", 
-                               response.status_code,
-                               response.text if response.text else "No error message")
-                    raise NonRetryableError(f"HTTP {response.status_code}: {response.text}")
-                
+                    logger.error(
+                        "Got error status %d: %s",
+                        response.status_code,
+                        response.text if response.text else "No error message",
+                    )
+                    raise NonRetryableError(
+                        f"HTTP {response.status_code}: {response.text}"
+                    )
+
                 response.raise_for_status()
-                return response.json()
-                
-            except Exception as e:
+                if read is not None:
+                    return read(response)
+                return response if stream else _jloads(response)
+
+            except NonRetryableError:
+                raise
+            except _RETRYABLE_ERRORS as e:
+                # Transport failures and the session's own API errors; anything else
+                # (a bad body, a failed login) would fail the same way again
                 last_error = e
-                logger.error("Request failed - URL: %s, method: %s, params: %s, headers: %s, error: %s",
-                           url, method, request_params, headers, str(e))
+                logger.error(
+                    "Request failed - URL: %s, method: %s, params: %s, error: %s",
+                    url,
+                    method,
+                    request_params,
+                    str(e),
+                )
                 retry_count += 1
                 if retry_count < max_retries:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
+                    delay = _backoff(delay)
+                    time.sleep(delay)
                     continue
                 raise NonRetryableError(f"Request failed after {max_retries} retries: {str(e)}")
                 
@@ -246,107 +906,740 @@ class NotesService:
             raise NonRetryableError(f"Max retries exceeded: {str(last_error)}")
         return None
 
+    def _prepare_request(
+        self, endpoint: str, data: Optional[Dict], params: Optional[Dict]
+    ) -> Tuple[str, Dict, Optional[Dict]]:
+        """Resolve the URL and merge params and body once for every attempt of a request.
+
+        The request gets one requestID, shared by its params and body and kept
+        across retries; a requestID already in the body is reused.
+        """
+        if params:
+            request_params = {**self._request_params, **params}
+        else:
+            request_params = self._request_params.copy()  # _cloudKitVersion is always 2
+        if data and isinstance(data, dict):
+            data = {**data, **_BODY_BASE}  # A copy, so the caller's dict is left alone
+            request_id = data.get("requestID") or str(uuid.uuid4()).upper()
+            data["requestID"] = request_id
+        else:
+            request_id = str(uuid.uuid4()).upper()
+        request_params["requestID"] = request_id
+
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            url = (
+                endpoint
+                if endpoint.startswith("http")
+                else f"{self._service_root}{endpoint}"
+            )
+            self._url_cache[endpoint] = url
+        return url, request_params, data
+
+    def _new_httpx_client(self, client_class, limits):
+        """Create an httpx client that shares the session's headers and cookie jar."""
+        options = {
+            "timeout": REQUEST_TIMEOUT,
+            "limits": limits,
+            "headers": dict(self.session.headers),
+            "cookies": self.session.cookies,  # Shares the jar so auth refreshes carry over
+        }
+        try:
+            return client_class(http2=True, **options)
+        except ImportError:  # The h2 package is missing, stay on HTTP/1.1
+            return client_class(**options)
+
+    def _async_client(self) -> "httpx.AsyncClient":
+        """Return the shared async client, creating it on first use."""
+        if httpx is None:
+            raise PyiCloudException("httpx is required for async notes requests")
+        if self._async is None:
+            self._async = self._new_httpx_client(
+                httpx.AsyncClient, httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS)
+            )
+        return self._async
+
+    def close(self) -> None:
+        """Close the httpx client used when use_httpx is set."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    async def _amake_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        timeout: int = REQUEST_TIMEOUT,
+    ) -> Optional[Any]:
+        """Async counterpart of _make_request over a multiplexed HTTP/2 client."""
+        client = self._async_client()
+        url, request_params, data = self._prepare_request(endpoint, data, params)
+        is_get = method.lower() == "get"
+        last_error = None
+        retry_count = 0
+        throttled = 0
+        auth_refreshes = 0
+        delay = _BACKOFF_BASE
+
+        while retry_count < self._max_retries:
+            retry_count += 1
+            try:
+                response = await client.request(
+                    "GET" if is_get else "POST",
+                    url,
+                    params=request_params,
+                    content=None if is_get or data is None else _jdumps(data),
+                    headers=self._request_headers(static=True),
+                    timeout=timeout,
+                )
+            except httpx.HTTPError as e:
+                last_error = e
+                logger.error(
+                    "Async request failed - URL: %s, method: %s, error: %s",
+                    url,
+                    method,
+                    str(e),
+                )
+                if retry_count < self._max_retries:
+                    delay = _backoff(delay)
+                    await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in (401, 450) or (
+                response.status_code == 500
+                and "Authentication required" in response.text
+            ):
+                self._check_auth_refreshes(auth_refreshes, response)
+                auth_refreshes += 1
+                logger.debug("Got %d, attempting auth refresh", response.status_code)
+                await asyncio.get_running_loop().run_in_executor(
+                    self._pool, self._reauthenticate
+                )
+                continue
+            if response.status_code in (429, 503):
+                throttled += 1
+                if throttled <= _FREE_THROTTLE_RETRIES:
+                    retry_count -= (
+                        1  # The first few throttled answers do not use up a retry
+                    )
+                if retry_count < self._max_retries:
+                    delay = _retry_after(response, delay)
+                    logger.warning(
+                        "Got %d, waiting %.2f seconds before retry",
+                        response.status_code,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                continue
+            if response.status_code >= 400:
+                logger.error(
+                    "Got error status %d: %s",
+                    response.status_code,
+                    response.text if response.text else "No error message",
+                )
+                raise NonRetryableError(f"HTTP {response.status_code}: {response.text}")
+            return _jloads(response)
+
+        if last_error:
+            raise NonRetryableError(f"Max retries exceeded: {str(last_error)}")
+        return None
+
+    async def aclose(self) -> None:
+        """Close the async client if one was opened."""
+        if self._async is not None:
+            await self._async.aclose()
+            self._async = None
+
+    def _build_static_headers(self) -> Dict[str, str]:
+        """Build the CloudKit headers that stay the same between auth refreshes."""
+        token = self.session.service.session_data.get("session_token")
+        return {
+            "X-Apple-Web-Token": token,
+            "X-Apple-Time-Zone": self._tz_name,
+            "X-Apple-CloudKit-Request-Context": "notes",
+            "X-Apple-CloudKit-Request-Environment": "production",
+            "X-Apple-CloudKit-Request-SigningVersion": "3",
+            "X-Apple-CloudKit-Request-KeyID": self.session.service.client_id,
+            "X-Apple-CloudKit-Request-Container": "com.apple.notes",
+            "X-Apple-CloudKit-Request-Schema": _SCHEMA,
+            "X-Apple-I-Web-Token": token,
+            "X-Apple-Routing-Key": f"{self.params['dsid']}:0:notes",
+            "X-Apple-I-Protocol-Version": "2.0",  # Match CloudKit version
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",  # Survives the header reset of a forced auth refresh
+            "Origin": "https://www.icloud.com",
+            "Referer": "https://www.icloud.com/",
+        }
+
+    def _request_headers(self, static: bool = False) -> Dict[str, str]:
+        """Return the per-request CloudKit headers, stamped with the current time.
+
+        Requests sent through the session get their static headers from the
+        mounted _NotesAdapter, so only the timestamps are returned unless
+        static is set.
+        """
+        timestamp_z = _utc_timestamp()
+        headers = self._static_headers.copy() if static else {}
+        headers["X-Apple-CloudKit-Request-ISO8601Timestamp"] = timestamp_z
+        headers["X-Apple-I-ClientTime"] = timestamp_z  # Use same format
+        return headers
+
+    @staticmethod
+    def _check_auth_refreshes(auth_refreshes: int, response) -> None:
+        """Give up on a request whose auth failure survived an auth refresh."""
+        if auth_refreshes >= _MAX_AUTH_REFRESHES:
+            logger.error(
+                "Got %d again after refreshing authentication", response.status_code
+            )
+            raise NonRetryableError(
+                f"HTTP {response.status_code}: authentication refresh failed"
+            )
+
+    def _reauthenticate(self) -> None:
+        """Force a notes auth refresh and pick up the new session token.
+
+        Requests failing auth at the same time share one refresh: a caller
+        that waited on the lock while another refreshed reuses that result.
+        """
+        with self._auth_lock:
+            if time.monotonic() - self._auth_refreshed_at < _AUTH_REFRESH_WINDOW:
+                return
+            self.session.service.authenticate(True, "notes")
+            self._static_headers = (
+                self._adapter.static_headers
+            ) = self._build_static_headers()
+            self._auth_refreshed_at = time.monotonic()
+
+    def _now_local(self) -> str:
+        """Return the current time in the local timezone resolved at init, formatted for Notes."""
+        return datetime.now(self._local_tz).strftime(_LOCAL_TIME_FORMAT)
+
+    def _post_mutation(self, note_entry: Dict) -> Optional[Dict]:
+        """POST one note change to /no/content, coalescing it with concurrent ones.
+
+        Returns the response with "notes" narrowed to this change's entry.
+        """
+        return self._mutations.submit(note_entry)
+
+    def _send_mutations(self, entries: List[Dict]) -> List[Optional[Dict]]:
+        """POST a batch of note changes and split the response between them."""
+        response = self._post_json("/no/content", data={"notes": entries})
+        return _split_mutation_response(response, entries)
+
+    def _send_reads(self, note_ids: List[str]) -> List[Optional[Dict]]:
+        """Fetch a batch of notes queued by get_note(), in request order."""
+        notes = self.get_notes(note_ids)
+        return [notes.get(note_id) for note_id in note_ids]
+
+    def _intern_tags(self, tags: Optional[List[str]]) -> frozenset:
+        """Return tags as a frozenset sharing one string object per distinct tag."""
+        if not tags:
+            return frozenset()
+        intern = self._tag_intern
+        return frozenset(intern.setdefault(tag, sys.intern(tag)) for tag in tags)
+
+    def _cache_search_fields(self, note_data: Dict) -> Dict:
+        """Store case-folded title, content and tags for the local search fallback."""
+        note_data["_title_lc"] = (
+            note_data.get("title") or note_data.get("subject") or ""
+        ).casefold()
+        note_data["_content_lc"] = (note_data.get("content") or "").casefold()
+        note_data["_tags_lc"] = frozenset(
+            tag.casefold() for tag in note_data.get("tags") or []
+        )
+        self._notes_table = None
+        return note_data
+
+    def _store_note(self, guid: str, note_data: Dict) -> None:
+        """Cache a note by GUID and index its tags and words, replacing any previous copy."""
+        previous = self._notes_by_guid.get(guid)
+        if previous is not None and previous is not note_data:
+            self._unindex_note(guid, previous)
+        self._notes_by_guid[guid] = note_data
+        self._clear_search_cache()
+        for tag in note_data.get("_tags_lc", ()):
+            self._notes_by_tag[tag].add(guid)
+        for token in _index_tokens(note_data):
+            self._notes_by_token[token].add(guid)
+
+    def _clear_search_cache(self) -> None:
+        """Forget cached search results after a note changed."""
+        with self._search_cache_lock:
+            self._search_generation += 1
+            self._search_cache.clear()
+
+    def _unindex_note(self, guid: str, note_data: Dict) -> None:
+        """Drop a note from the tag and word indexes."""
+        for index, keys in (
+            (self._notes_by_tag, note_data.get("_tags_lc", ())),
+            (self._notes_by_token, _index_tokens(note_data)),
+        ):
+            for key in keys:
+                guids = index.get(key)
+                if guids is not None:
+                    guids.discard(guid)
+                    if not guids:
+                        del index[key]
+
+    def _append_to_list(self, folder_name: str, guid: str, note_data: Dict) -> None:
+        """Add a note to a folder's notes."""
+        self.lists[folder_name][guid] = note_data
+
+    def _remove_from_list(self, guid: str, folder_name: str) -> None:
+        """Remove a note from its folder's notes."""
+        if self.lists[folder_name].pop(guid, None) is None:
+            # The note is filed under another folder than recorded
+            for notes in self.lists.values():
+                if notes.pop(guid, None) is not None:
+                    break
+
+    def _build_notes_table(self) -> "_NotesTable":
+        """Snapshot the cached notes into columns for the local search fallback."""
+        self._notes_table = _NotesTable(self._notes_by_guid)
+        return self._notes_table
+
+    def _startup_params(self, sync_token: str = "") -> Dict:
+        """Return the query parameters for a /no/startup request."""
+        return {
+            "syncToken": sync_token,
+            "requestID": str(uuid.uuid4()).upper(),
+            "schema": _SCHEMA,  # Updated schema version
+            "_cloudKitVersion": "3",  # Updated CloudKit version
+            "timeout": 10000,
+        }
+
+    def _apply_startup(self, startup_response: Dict) -> None:
+        """Bring the folder and note caches in line with a full /no/startup response."""
+        if (
+            self.collections
+            and startup_response.get("syncToken") == self._last_sync_token
+        ):
+            return
+        self._apply_startup_items(startup_response.items())
+
+    def _apply_startup_items(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Bring the caches in line with the top-level fields of a full /no/startup response.
+
+        Notes may also arrive one at a time under "notes.item", as a streamed
+        response is parsed. Cached notes whose modification date is unchanged
+        are kept as they are, and notes missing from the response are dropped.
+        """
+        self.collections = {}
+        seen = set()
+        fields = {}
+
+        def merge(note):
+            seen.add(self._merge_note(note, fields.get("syncToken", "")))
+
+        # Folders are processed first; notes seen before them wait
+        waiting = []
+        folders_seen = False
+        for key, value in items:
+            if key == "folders":
+                self._merge_folders(value)
+                self._ensure_root_folder(fields.get("syncToken", ""))
+                folders_seen = True
+                for note in waiting:
+                    merge(note)
+                waiting = []
+            elif key in ("notes", "notes.item"):
+                notes = value if key == "notes" else (value,)
+                if folders_seen:
+                    for note in notes:
+                        merge(note)
+                else:
+                    waiting.extend(notes)
+            else:
+                fields[key] = value
+        if not folders_seen:
+            self._ensure_root_folder(fields.get("syncToken", ""))
+            for note in waiting:
+                merge(note)
+
+        stale = [guid for guid in self._notes_by_guid if guid not in seen]
+        for guid in stale:
+            self._drop_note(guid)
+        for folder_name in [
+            name for name in self.lists if name not in self.collections
+        ]:
+            del self.lists[folder_name]
+
+        if self._notes_table is None:
+            self._build_notes_table()
+        self._last_sync_token = fields.get("syncToken")
+
+    def _ensure_root_folder(self, sync_token: str) -> None:
+        """Create default root folder if no folders exist."""
+        if not self.collections:
+            self.collections["/"] = {
+                "guid": "root",
+                "ctag": sync_token,
+                "type": "folder",
+                "parentId": "root",
+                "order": 0,
+                "version": 1,
+                "isShared": False,
+            }
+            self.lists.setdefault("/", {})
+
+    def _apply_startup_delta(self, startup_response: Dict) -> None:
+        """Merge the changes of an incremental /no/startup response into the caches."""
+        sync_token = startup_response.get("syncToken", "")
+        self._merge_folders(startup_response.get("folders", []))
+        for note in startup_response.get("notes", []):
+            self._merge_note(note, sync_token)
+        self._last_sync_token = sync_token or self._last_sync_token
+
+    def _merge_folders(self, folders: List[Dict]) -> None:
+        """Insert or replace folders from a /no/startup response."""
+        merged = dict(map(_folder_entry, folders))
+        self.collections.update(merged)
+        lists = self.lists
+        for folder_name in merged:
+            if folder_name not in lists:
+                lists[folder_name] = {}
+
+    def _drop_note(self, guid: str) -> Optional[Dict]:
+        """Remove a note from every cache, returning it if it was cached."""
+        previous = self._notes_by_guid.pop(guid, None)
+        if previous is not None:
+            self._unindex_note(guid, previous)
+            self._remove_from_list(
+                guid, previous.get("folder") or previous.get("folderName", "/")
+            )
+            self._notes_table = None
+            self._clear_search_cache()
+        return previous
+
+    def _merge_note(self, note: Dict, sync_token: str) -> Optional[str]:
+        """Insert or replace one note from a /no/startup response, dropping it if deleted.
+
+        A cached note with the same modification date and folder is left
+        untouched. Returns the note's GUID.
+        """
+        get = note.get
+        note_guid = get("identifier") or get("noteGuid")
+        deleted = get("deleted") or get("status") == "deleted"
+        # One string shared by every note in the folder
+        folder_name = sys.intern(get("folderName") or "/")
+        modified = get("modified") or get("lastModifiedDate")
+        previous = self._notes_by_guid.get(note_guid)
+        if (
+            previous is not None
+            and not deleted
+            and modified is not None
+            and previous.get("modified") == modified
+            and (previous.get("folder") or previous.get("folderName")) == folder_name
+            and folder_name in self.collections
+        ):
+            return note_guid
+        if previous is not None:
+            self._drop_note(note_guid)
+        if deleted:
+            return note_guid
+
+        if folder_name not in self.collections:
+            self.collections[folder_name] = {
+                "guid": f"folder_{folder_name}",
+                "ctag": sync_token,
+                "type": "folder",
+                "parentId": "root",
+                "order": len(self.collections),
+                "version": 1,
+                "isShared": False,
+            }
+            self.lists.setdefault(folder_name, {})
+
+        # Extract note data with proper field mapping
+        note_data = Note()
+        note_data["guid"] = note_guid
+        note_id = get("noteId", _MISSING)
+        note_data["noteId"] = (
+            f"{note_guid}%Tm90ZXM=%{int(time.time())}"
+            if note_id is _MISSING
+            else note_id
+        )
+        note_data["title"] = get("title") or get("subject", "")
+        note_data["folder"] = folder_name
+        note_data["size"] = get("contentLength") or get("size", 0)
+        note_data["modified"] = modified
+        note_data["content"] = get("content") or (get("detail") or _EMPTY).get(
+            "content"
+        )
+        note_data["tags"] = self._intern_tags(get("tags"))
+        note_data["created"] = get("created") or get("createdDate")
+        note_data["isShared"] = get("isShared", False)
+        note_data["hasAttachments"] = get("hasAttachments", False)
+        note_data["version"] = get("version", 1)
+        note_data["folderId"] = self.collections[folder_name]["guid"]
+        if note_data.content is None:
+            self._unfetched.append(note_guid)
+        self._cache_search_fields(note_data)
+        self._append_to_list(folder_name, note_guid, note_data)
+        self._store_note(note_guid, note_data)
+        return note_guid
+
+    def _cache_path(self) -> Optional[str]:
+        """Return the file the synced notes are persisted to, or None if disabled."""
+        directory = getattr(self.session.service, "_cookie_directory", None)
+        if not self._disk_cache or not directory:
+            return None
+        return os.path.join(directory, f"notes-{self.params['dsid']}.json")
+
+    def _snapshot(self) -> Dict:
+        """Return the cached folders and notes in the shape of a /no/startup response."""
+        folders = [
+            {
+                "identifier": folder["guid"],
+                "name": name,
+                "serverCtag": folder["ctag"],
+                "parentIdentifier": folder["parentId"],
+                "sortOrder": folder["order"],
+                "version": folder["version"],
+                "isShared": folder["isShared"],
+            }
+            for name, folder in self.collections.items()
+        ]
+        notes = []
+        for guid, note in self._notes_by_guid.items():
+            entry = {
+                "identifier": guid,
+                "title": note.get("title") or note.get("subject", ""),
+                "folderName": note.get("folder") or note.get("folderName", "/"),
+                "size": note.get("size", 0),
+                "modified": note.get("modified"),
+                "content": note.get("content"),
+                "tags": list(note.get("tags") or ()),
+                "created": note.get("created"),
+                "isShared": note.get("isShared", False),
+                "hasAttachments": note.get("hasAttachments", False),
+                "version": note.get("version", 1),
+            }
+            if "noteId" in note:
+                entry["noteId"] = note["noteId"]
+            notes.append(entry)
+        return {"syncToken": self._last_sync_token, "folders": folders, "notes": notes}
+
+    def _load_disk_cache(self) -> bool:
+        """Fill the caches from the notes persisted by an earlier instance."""
+        path = self._cache_path()
+        if path is None or not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as cache_file:
+                snapshot = _jparse(cache_file.read())
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable notes cache %s: %s", path, e)
+            return False
+        if not isinstance(snapshot, dict) or not snapshot.get("syncToken"):
+            return False
+        self._apply_startup(snapshot)
+        # Bodies missing from the saved copy are fetched on access by get_note()
+        self._unfetched = []
+        return True
+
+    def _save_disk_cache(self) -> None:
+        """Persist the cached notes so the next instance can sync from their token.
+
+        The file holds note contents in plain text and is written owner-only (0600).
+        """
+        path = self._cache_path()
+        if path is None or not self._last_sync_token:
+            return
+        temp_path = f"{path}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, 0o600)  # The mode above only applies to a new file
+            with os.fdopen(fd, "wb") as cache_file:
+                cache_file.write(_jdumps(self._snapshot()))
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug("Failed to write notes cache %s: %s", path, e)
+
+    def _stream_startup(self, params: Dict) -> bool:
+        """Fetch /no/startup with a streamed body and rebuild the caches once it is parsed.
+
+        Nothing is applied until the whole body has been read, so a response
+        cut short leaves the caches as they were.
+        """
+        items = self._get_stream("/no/startup", _read_startup_items, params=params)
+        if items is None:
+            logger.error("Failed to refresh notes: No response")
+            return False
+        self._apply_startup_items(items)
+        return True
+
+    def _body_request(self, guids: List[str]) -> Dict:
+        """Build the /no/content request for the bodies of the given notes."""
+        return {
+            **_BODY_BASE,  # requestID is stamped by _prepare_request
+            "notes": [
+                {"identifier": guid, "noteGuid": guid, "type": "note"} for guid in guids
+            ],
+            "options": {
+                "includeContent": True,
+                "includeDeleted": False,
+                "includeShared": True,
+            },
+        }
+
+    def _fetch_missing_bodies(self) -> None:
+        """Fill in the content of the notes this sync merged without a body.
+
+        Bodies are requested BATCH_SIZE notes per /no/content POST, with the
+        chunks fetched concurrently. Notes left without a body are fetched
+        on access by get_note() rather than again on the next sync.
+        """
+        guids, self._unfetched = self._unfetched, []
+        notes = self._notes_by_guid
+        guids = [
+            guid
+            for guid in dict.fromkeys(guids)
+            if guid in notes and notes[guid].get("content") is None
+        ]
+        if not guids:
+            return
+        chunks = [guids[i : i + BATCH_SIZE] for i in range(0, len(guids), BATCH_SIZE)]
+
+        def fetch(chunk):
+            return self._post_json("/no/content", data=self._body_request(chunk))
+
+        for chunk, response in zip(chunks, self._pool.map(fetch, chunks)):
+            if not response:
+                logger.warning("Failed to fetch the bodies of %d notes", len(chunk))
+                continue
+            for note in response.get("notes") or ():
+                cached = self._notes_by_guid.get(
+                    note.get("identifier") or note.get("noteGuid")
+                )
+                if cached is not None and note.get("content") is not None:
+                    cached["content"] = note["content"]
+                    self._cache_search_fields(cached)
+
+    def _sync(self, sync_token: str) -> bool:
+        """Fetch /no/startup since sync_token (everything if empty) and apply it."""
+        if not sync_token and ijson is not None and self._http is None:
+            if not self._stream_startup(self._startup_params()):
+                return False
+            self._fetch_missing_bodies()
+            self._save_disk_cache()
+            return True
+
+        # Get initial startup data with proper parameters
+        startup_response = self._get_json(
+            "/no/startup", params=self._startup_params(sync_token)
+        )
+        if not startup_response:
+            logger.error("Failed to refresh notes: No response")
+            return False
+
+        logger.debug("Startup response: %s", startup_response)
+
+        if not sync_token:
+            self._apply_startup(startup_response)
+        elif startup_response.get("changes") == [] or (
+            not startup_response.get("notes") and not startup_response.get("folders")
+        ):
+            logger.debug("Notes unchanged since sync token %s", sync_token)
+            if startup_response.get("syncToken") in (None, sync_token):
+                return True
+            self._last_sync_token = startup_response["syncToken"]
+        else:
+            self._apply_startup_delta(startup_response)
+        self._fetch_missing_bodies()
+        self._save_disk_cache()
+        return True
+
     def refresh(self) -> bool:
-        """Refresh the notes data from iCloud."""
+        """Refresh the notes data from iCloud.
+
+        Once the caches are populated, only the changes since the last sync
+        token are requested and merged in; nothing is touched if there are none.
+        A fresh instance starts from the notes persisted on disk, if any.
+        """
         try:
-            # Get initial startup data with proper parameters
-            startup_response = self._make_request(
-                "get",  # Try GET instead of POST
-                "/no/startup",
-                params={
-                    "syncToken": "",
-                    "requestID": str(uuid.uuid4()).upper(),
-                    "schema": "chunked:3",  # Updated schema version
-                    "_cloudKitVersion": "3",  # Updated CloudKit version
-                    "timeout": 10000
-                }
+            sync_token = (self._last_sync_token or "") if self.collections else ""
+            if not sync_token and self._load_disk_cache():
+                try:
+                    if self._sync(self._last_sync_token):
+                        return True
+                except Exception as e:
+                    logger.debug("Could not sync the cached notes, reloading: %s", e)
+            return self._sync(sync_token)
+
+        except Exception as e:
+            logger.error("Failed to refresh notes: %s", e)
+            return False
+
+    def full_refresh(self) -> bool:
+        """Discard the cached notes and reload everything from iCloud.
+
+        Unlike refresh(), this ignores the last sync token and the notes
+        persisted on disk.
+        """
+        self.collections = {}
+        self.lists.clear()
+        self._notes_by_guid.clear()
+        self._notes_by_tag.clear()
+        self._notes_by_token.clear()
+        self._notes_table = None
+        self._last_sync_token = None
+        self._unfetched = []
+        self._clear_search_cache()
+        with self._get_cache_lock:
+            self._get_cache.clear()
+        try:
+            return self._sync("")
+        except Exception as e:
+            logger.error("Failed to refresh notes: %s", e)
+            return False
+
+    async def arefresh(self) -> bool:
+        """Refresh the notes data from iCloud, fetching every folder concurrently.
+
+        Loads /no/startup, then requests the notes of all folders at once over
+        a single HTTP/2 connection. Requires the optional httpx package.
+        """
+        try:
+            startup_response = await self._amake_request(
+                "get", "/no/startup", params=self._startup_params()
             )
             if not startup_response:
                 logger.error("Failed to refresh notes: No response")
                 return False
-            
-            logger.debug("Startup response: %s", startup_response)
-
-            # Initialize collections
-            self.collections = {}
-            self.lists = defaultdict(list)
-            self._notes_by_guid = {}
-            self._tags = set()
-
-            # Process folders first
-            folders = startup_response.get('folders', [])
-            for folder in folders:
-                folder_guid = folder.get('identifier') or folder.get('folderId')
-                folder_name = folder.get('name') or folder.get('folderName', '/')
-                self.collections[folder_name] = {
-                    "guid": folder_guid or f"folder_{folder_name}",
-                    "ctag": folder.get('serverCtag') or folder.get('etag', ''),
-                    "type": "folder",
-                    "parentId": folder.get('parentIdentifier') or folder.get('parentId', 'root'),
-                    "order": folder.get('sortOrder') or folder.get('order', 0),
-                    "version": folder.get('version', 1),
-                    "isShared": folder.get('isShared', False)
-                }
+            self._apply_startup(startup_response)
 
-            # Create default root folder if no folders exist
-            if not self.collections:
-                self.collections['/'] = {
-                    "guid": "root",
-                    "ctag": startup_response.get('syncToken', ''),
-                    "type": "folder",
-                    "parentId": "root",
-                    "order": 0,
-                    "version": 1,
-                    "isShared": False
-                }
-
-            # Initialize empty lists for all folders
-            for folder_name in self.collections:
-                if folder_name not in self.lists:
-                    self.lists[folder_name] = []
-
-            # Process notes
-            notes = startup_response.get('notes', [])
-            for note in notes:
-                folder_name = note.get('folderName', '/')
-                if folder_name not in self.collections:
-                    self.collections[folder_name] = {
-                        "guid": f"folder_{folder_name}",
-                        "ctag": startup_response.get('syncToken', ''),
-                        "type": "folder",
-                        "parentId": "root",
-                        "order": len(self.collections),
-                        "version": 1,
-                        "isShared": False
-                    }
-                    self.lists[folder_name] = []
-                
-                # Extract note data with proper field mapping
-                note_guid = note.get('identifier') or note.get('noteGuid')
-                note_data = {
-                    "guid": note_guid,
-                    "noteId": note.get('noteId', f"{note_guid}%Tm90ZXM=%{int(time.time())}"),
-                    "title": note.get('title') or note.get('subject', ''),
-                    "folder": folder_name,
-                    "size": note.get('contentLength') or note.get('size', 0),
-                    "modified": note.get('modified') or note.get('lastModifiedDate'),
-                    "content": note.get('content') or note.get('detail', {}).get('content'),
-                    "tags": note.get('tags', []),
-                    "created": note.get('created') or note.get('createdDate'),
-                    "isShared": note.get('isShared', False),
-                    "hasAttachments": note.get('hasAttachments', False),
-                    "version": note.get('version', 1),
-                    "folderId": self.collections[folder_name]["guid"]
-                }
-                self.lists[folder_name].append(note_data)
-                self._notes_by_guid[note_data['guid']] = note_data
-                if note_data['tags']:
-                    self._tags.update(note_data['tags'])
+            folders = [
+                (name, folder["guid"]) for name, folder in self.collections.items()
+            ]
+            responses = await asyncio.gather(
+                *(
+                    self._amake_request(
+                        "post",
+                        "/no/folder/notes",
+                        data=self._folder_notes_request(name, guid),
+                    )
+                    for name, guid in folders
+                ),
+                return_exceptions=True,
+            )
+            for (name, guid), response in zip(folders, responses):
+                if isinstance(response, Exception):
+                    logger.warning(
+                        "Failed to fetch notes for folder %s: %s", name, response
+                    )
+                elif response and "notes" in response:
+                    self._apply_folder_notes(name, guid, response)
+            self._build_notes_table()
 
             return True
 
         except Exception as e:
-            logger.error(f"Failed to refresh notes: {str(e)}")
+            logger.error("Failed to refresh notes: %s", e)
             return False
 
     def create(self, title: str, body: str, collection: Optional[str] = None,
@@ -354,11 +1647,14 @@ class NotesService:
         """Create a new note."""
         try:
             # Ensure collection exists, fallback to default if not
-            if collection and collection not in self.collections:
-                logger.warning(f"Collection {collection} not found, using default folder")
-                collection = self._default_folder
-            elif not collection:
+            folder = self.collections.get(collection) if collection else None
+            if folder is None:
+                if collection:
+                    logger.warning(
+                        "Collection %s not found, using default folder", collection
+                    )
                 collection = self._default_folder
+                folder = self.collections.get(collection, _EMPTY)
 
             # Generate unique IDs
             note_guid = str(uuid.uuid4()).upper()
@@ -366,11 +1662,9 @@ class NotesService:
 
             # Format the content as HTML if not already HTML
             if not body.startswith('<html>'):
-                body = f'<html><head><meta charset="UTF-8"><meta name="apple-notes-version" content="3.0"><meta name="apple-notes-editable" content="true"></head><body style="word-wrap: break-word; -webkit-nbsp-mode: space; -webkit-line-break: after-white-space;">{body}</body></html>'
+                body = _wrap_html(body)
 
-            # Get current time in correct format
-            now = datetime.utcnow()
-            timestamp_z = now.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'  # Truncate microseconds to 3 digits
+            timestamp_z = _utc_timestamp()
 
             # Prepare note data
             note_data = {
@@ -379,7 +1673,7 @@ class NotesService:
                 "subject": title,
                 "content": body,
                 "folderName": collection,
-                "folderGuid": self.collections.get(collection, {}).get("guid", "root"),
+                "folderGuid": folder.get("guid", "root"),
                 "createdDate": timestamp_z,  # Use consistent format
                 "lastModifiedDate": timestamp_z,  # Use consistent format
                 "tags": tags or [],
@@ -394,20 +1688,14 @@ class NotesService:
                 "status": "active"
             }
 
-            # Make request with consistent API versions
-            request_data = {
-                "notes": [note_data]  # Let _make_request handle requestID and version
-            }
-
-            response = self._make_request(
-                "post",
-                "/no/content",
-                data=request_data
-            )
+            response = self._post_mutation(note_data)
 
             if response and response.get("status", 0) == 0:
-                self._notes_by_guid[note_guid] = note_data
-                self.lists[collection].append(note_data)
+                note_data = Note(note_data)
+                note_data["tags"] = self._intern_tags(note_data["tags"])
+                self._cache_search_fields(note_data)
+                self._store_note(note_guid, note_data)
+                self._append_to_list(collection, note_guid, note_data)
                 return note_guid
 
         except Exception as e:
@@ -416,71 +1704,88 @@ class NotesService:
 
         return None
 
-    def get_note(self, note_id: str) -> Optional[Dict]:
-        """Get a note by its ID."""
-        try:
-            # Format the request with proper parameters
-            request_data = {
-                "requestID": str(uuid.uuid4()).upper(),
-                "schema": "chunked:3",  # Updated schema version
-                "_cloudKitVersion": "3",  # Updated CloudKit version
-                "notes": [{
-                    "identifier": note_id,
-                    "noteGuid": note_id,
-                    "type": "note",
-                    "status": "active"
-                }],
-                "options": {
-                    "includeContent": True,
-                    "includeDeleted": False,
-                    "includeShared": True
-                }
-            }
+    def get_note(
+        self, note_id: str, use_cache: bool = True, max_age: float = NOTE_MAX_AGE
+    ) -> Optional[Dict]:
+        """Get a note by its ID.
 
-            response = self._make_request(
-                "post",
-                "/no/content",
-                data=request_data,
-                timeout=REQUEST_TIMEOUT
-            )
+        With use_cache, a note fetched with its content less than max_age
+        seconds ago is returned from the cache without a request. Calls made
+        from other threads while a fetch is in flight are fetched together in
+        the next /no/content request.
+        """
+        if use_cache:
+            cached = self._notes_by_guid.get(note_id)
+            if (
+                cached is not None
+                and cached.get("content") is not None
+                and time.monotonic() - cached.get("_fetched_at", -max_age) < max_age
+            ):
+                return _note_with_body(cached)
+        return self._reads.submit(note_id)
 
-            if response and 'notes' in response:
-                note = response['notes'][0]
-                note_data = {
-                    "guid": note.get('identifier') or note.get('noteGuid'),
-                    "title": note.get('title') or note.get('subject', ''),
-                    "folderName": note.get('folderName', '/'),
-                    "folderGuid": note.get('folderGuid'),
-                    "size": note.get('contentLength') or note.get('size', 0),
-                    "modified": note.get('lastModifiedDate'),
-                    "content": note.get('content'),
-                    "tags": note.get('tags', []),
-                    "created": note.get('createdDate'),
-                    "isShared": note.get('isShared', False),
-                    "hasAttachments": note.get('hasAttachments', False),
-                    "format": note.get('format', 'html'),
-                    "encoding": note.get('encoding', 'UTF-8'),
-                    "status": note.get('status', 'active'),
-                    "version": note.get('version', 1)
+    def get_notes(self, note_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Get copies of several notes by ID, keyed by ID.
+
+        Notes are requested BATCH_SIZE per /no/content POST, with the batches
+        sent concurrently. A note the server does not return is taken from
+        the local cache if it is there, and left out otherwise.
+        """
+        note_ids = list(dict.fromkeys(note_ids))
+        chunks = [
+            note_ids[i : i + BATCH_SIZE] for i in range(0, len(note_ids), BATCH_SIZE)
+        ]
+
+        def fetch(chunk):
+            request_data = self._body_request(chunk)
+            try:
+                return request_data["notes"], self._post_json(
+                    "/no/content", data=request_data, timeout=REQUEST_TIMEOUT
+                )
+            except NonRetryableError as e:
+                logger.error("Failed to get notes: %s", e)
+            except Exception as e:
+                logger.error("Unexpected error getting notes: %s", e)
+            return request_data["notes"], None
+
+        results = {}
+        responses = (
+            map(fetch, chunks) if len(chunks) == 1 else self._pool.map(fetch, chunks)
+        )
+        for entries, response in responses:
+            if not response or not response.get("notes"):
+                continue
+            notes = response["notes"]
+            if len(entries) == 1:
+                # A single note is taken as returned, whatever identifier it carries
+                by_id = {entries[0]["identifier"]: notes[0]}
+            else:
+                by_id = {
+                    note.get("identifier") or note.get("noteGuid"): note
+                    for note in notes
                 }
-                # Update local cache
-                self._notes_by_guid[note_id] = note_data
-                if note_data['tags']:
-                    self._tags.update(note_data['tags'])
-                note_data["body"] = re.sub('<[^<]+?>', '', note_data.get("content", "")).strip()
-                # Ensure the note data includes the expected "collection" key
-                note_data["collection"] = note_data.get("folderName", "/")
-                return note_data
+            for note_id, note in by_id.items():
+                results[note_id] = _note_with_body(
+                    self._cache_fetched_note(note_id, note)
+                )
 
-            # Fallback to local cache if server request fails
-            return self._notes_by_guid.get(note_id)
+        # Fallback to local cache for notes the server did not return
+        for note_id in note_ids:
+            if note_id not in results and note_id in self._notes_by_guid:
+                results[note_id] = _note_with_body(self._notes_by_guid[note_id])
+        return results
 
-        except NonRetryableError as e:
-            logger.error(f"Failed to get note: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error getting note: {str(e)}")
-            
-        return None
+    def _cache_fetched_note(self, note_id: str, note: Dict) -> "Note":
+        """Cache a note from a /no/content response and return the cached note."""
+        note_data = Note(_extract(note))
+        note_data["folderName"] = sys.intern(note.get("folderName") or "/")
+        note_data["folderGuid"] = note.get("folderGuid")
+        note_data["tags"] = self._intern_tags(note.get("tags"))
+        # Update local cache
+        self._cache_search_fields(note_data)
+        self._store_note(note_id, note_data)
+        note_data["_fetched_at"] = time.monotonic()
+        return note_data
 
     def update(self, note_id: str, title: Optional[str] = None,
               body: Optional[str] = None, tags: Optional[List[str]] = None) -> bool:
@@ -489,76 +1794,64 @@ class NotesService:
             return False
 
         current = self._notes_by_guid[note_id]
-        now = datetime.now()
-        local_tz = pytz.timezone(get_localzone_name())
-        now_local = now.astimezone(local_tz)
+        now_local = self._now_local()
 
         # Format the content as HTML if body is provided
         content = None
         if body is not None:
-            content = f'<html><head><meta charset="UTF-8"><meta name="apple-notes-version" content="3.0"><meta name="apple-notes-editable" content="true"></head><body style="word-wrap: break-word; -webkit-nbsp-mode: space; -webkit-line-break: after-white-space;">{body}</body></html>'
+            content = _wrap_html(body)
 
-        update_data = {
-            "requestID": str(uuid.uuid4()).upper(),
-            "schema": "chunked:3",  # Updated schema version
-            "_cloudKitVersion": "3",  # Updated CloudKit version
-            "notes": [{
-                "identifier": note_id,
-                "noteGuid": note_id,
-                "subject": title if title is not None else current.get("title"),
-                "content": content if content is not None else current.get("content"),
-                "folderName": current.get("folderName", "/"),
-                "folderGuid": current.get("folderGuid"),
-                "lastModifiedDate": now_local.strftime("%Y-%m-%dT%H:%M:%S.%f%z"),
-                "tags": tags if tags is not None else current.get("tags", []),
-                "type": "note",
-                "deleted": False,
-                "version": current.get("version", 1) + 1,
-                "contentLength": len(content) if content is not None else current.get("contentLength", 0),
-                "isShared": current.get("isShared", False),
-                "hasAttachments": current.get("hasAttachments", False),
-                "format": "html",
-                "encoding": "UTF-8",
-                "status": "active"
-            }]
+        note_update = {
+            "identifier": note_id,
+            "noteGuid": note_id,
+            "subject": title if title is not None else current.get("title"),
+            "content": content if content is not None else current.get("content"),
+            "folderName": current.get("folderName", "/"),
+            "folderGuid": current.get("folderGuid"),
+            "lastModifiedDate": now_local,
+            "tags": list(tags) if tags is not None else list(current.get("tags", [])),
+            "type": "note",
+            "deleted": False,
+            "version": current.get("version", 1) + 1,
+            "contentLength": len(content)
+            if content is not None
+            else current.get("contentLength", 0),
+            "isShared": current.get("isShared", False),
+            "hasAttachments": current.get("hasAttachments", False),
+            "format": "html",
+            "encoding": "UTF-8",
+            "status": "active",
         }
 
         try:
-            response = self._make_request(
-                "post",
-                "/no/content",
-                data=update_data,
-                timeout=REQUEST_TIMEOUT
-            )
+            response = self._post_mutation(note_update)
 
             if response and 'notes' in response:
-                updated_note = response['notes'][0]
-                # Update local cache
-                current.update({
-                    "title": update_data["notes"][0]["subject"],
-                    "content": update_data["notes"][0]["content"],
-                    "tags": update_data["notes"][0]["tags"],
-                    "modified": now_local.strftime("%Y-%m-%dT%H:%M:%S.%f%z"),
-                    "version": update_data["notes"][0]["version"],
-                    "contentLength": update_data["notes"][0]["contentLength"],
-                    "format": "html",
-                    "encoding": "UTF-8",
-                    "status": "active"
-                })
-                current["body"] = re.sub('<[^<]+?>', '', current.get("content", "")).strip()
-                # Also add the "collection" key using the folderName from the current cache
-                current["collection"] = current.get("folderName", "/")
-                
-                # Update tags set
-                if tags:
-                    self._tags.update(tags)
-                
+                # Update local cache; the next get_note() fetches what the server made of it
+                self._unindex_note(note_id, current)
+                current.pop("_fetched_at", None)
+                current.update(
+                    {
+                        "title": note_update["subject"],
+                        "content": note_update["content"],
+                        "tags": self._intern_tags(note_update["tags"]),
+                        "modified": now_local,
+                        "version": note_update["version"],
+                        "contentLength": note_update["contentLength"],
+                        "format": "html",
+                        "encoding": "UTF-8",
+                        "status": "active",
+                    }
+                )
+                self._cache_search_fields(current)
+                self._store_note(note_id, current)
+
                 return True
 
         except NonRetryableError as e:
-            logger.error(f"Failed to update note: {str(e)}")
+            logger.error("Failed to update note: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error updating note: {str(e)}")
+            logger.error("Unexpected error updating note: %s", e)
             
         return False
 
@@ -569,51 +1862,76 @@ class NotesService:
 
         try:
             note = self._notes_by_guid[note_id]
-            now = datetime.now()
-            local_tz = pytz.timezone(get_localzone_name())
-            now_local = now.astimezone(local_tz)
+            now_local = self._now_local()
             
-            delete_data = {
-                "requestID": str(uuid.uuid4()).upper(),
-                "schema": "chunked:3",  # Updated schema version
-                "_cloudKitVersion": "3",  # Updated CloudKit version
-                "notes": [{
-                    "identifier": note_id,
-                    "noteGuid": note_id,
-                    "folderGuid": note.get("folderGuid"),
-                    "deleted": True,
-                    "status": "deleted",
-                    "lastModifiedDate": now_local.strftime("%Y-%m-%dT%H:%M:%S.%f%z"),
-                    "version": note.get("version", 1) + 1,
-                    "type": "note"
-                }]
+            delete_entry = {
+                "identifier": note_id,
+                "noteGuid": note_id,
+                "folderGuid": note.get("folderGuid"),
+                "deleted": True,
+                "status": "deleted",
+                "lastModifiedDate": now_local,
+                "version": note.get("version", 1) + 1,
+                "type": "note",
             }
 
-            response = self._make_request(
-                "POST",
-                "/no/content",
-                data=delete_data,
-                timeout=REQUEST_TIMEOUT
-            )
+            response = self._post_mutation(delete_entry)
 
             if response and 'notes' in response:
                 # Update local cache
-                note = self._notes_by_guid.pop(note_id)
-                folder_name = note.get('folderName') or note.get('folder', '/')
-                # Remove from folder's list
-                self.lists[folder_name] = [
-                    n for n in self.lists[folder_name] 
-                    if n['guid'] != note_id
-                ]
+                self._drop_note(note_id)
                 return True
 
         except NonRetryableError as e:
-            logger.error(f"Failed to delete note: {str(e)}")
+            logger.error("Failed to delete note: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error deleting note: {str(e)}")
+            logger.error("Unexpected error deleting note: %s", e)
             
         return False
 
+    def _folder_notes_request(self, collection: str, collection_guid: str) -> Dict:
+        """Return the request body listing the notes of one folder."""
+        # Format the request with proper parameters
+        return {
+            **_BODY_BASE,  # requestID is stamped by _prepare_request
+            "folder": {
+                "identifier": collection_guid,
+                "folderGuid": collection_guid,
+                "name": collection,
+                "type": "folder",
+                "status": "active",
+            },
+            "options": {
+                "includeDeleted": False,
+                "includeShared": True,
+                "sortBy": "lastModifiedDate",
+                "sortOrder": "descending",
+                "maxResults": 1000,
+            },
+        }
+
+    def _apply_folder_notes(
+        self, collection: str, collection_guid: str, response: Dict
+    ) -> List[Dict]:
+        """Cache the notes of a /no/folder/notes response and return them."""
+        results = []
+        notes = response["notes"]
+        for note, fields in zip(notes, map(_extract, notes)):
+            fields["folderName"] = collection
+            fields["collection"] = collection
+            fields["folderGuid"] = collection_guid
+            fields["tags"] = self._intern_tags(note.get("tags"))
+            note_data = Note(fields)
+            self._cache_search_fields(note_data)
+            results.append(note_data)
+
+            # Update local cache
+            self._store_note(note_data["guid"], note_data)
+
+        # Update local collection cache
+        self.lists[collection] = {note_data["guid"]: note_data for note_data in results}
+        return results
+
     def get_notes_by_collection(self, collection: str) -> List[Dict]:
         """Get all notes in a collection."""
         try:
@@ -623,84 +1941,88 @@ class NotesService:
                 return []
             collection_guid = collection_data["guid"]
 
-            # Format the request with proper parameters
-            request_data = {
-                "requestID": str(uuid.uuid4()).upper(),
-                "schema": "chunked:3",  # Updated schema version
-                "_cloudKitVersion": "3",  # Updated CloudKit version
-                "folder": {
-                    "identifier": collection_guid,
-                    "folderGuid": collection_guid,
-                    "name": collection,
-                    "type": "folder",
-                    "status": "active"
-                },
-                "options": {
-                    "includeDeleted": False,
-                    "includeShared": True,
-                    "sortBy": "lastModifiedDate",
-                    "sortOrder": "descending",
-                    "maxResults": 1000
-                }
-            }
+            request_data = self._folder_notes_request(collection, collection_guid)
 
-            response = self._make_request(
-                "post",
+            response = self._post_json(
                 "/no/folder/notes",
                 data=request_data,
                 timeout=REQUEST_TIMEOUT
             )
 
             if response and 'notes' in response:
-                results = []
-                for note in response['notes']:
-                    note_data = {
-                        "guid": note.get('identifier') or note.get('noteGuid'),
-                        "title": note.get('title') or note.get('subject', ''),
-                        "folderName": collection,
-                        "collection": collection,
-                        "folderGuid": collection_guid,
-                        "size": note.get('contentLength') or note.get('size', 0),
-                        "modified": note.get('lastModifiedDate'),
-                        "content": note.get('content'),
-                        "tags": note.get('tags', []),
-                        "created": note.get('createdDate'),
-                        "isShared": note.get('isShared', False),
-                        "hasAttachments": note.get('hasAttachments', False),
-                        "format": note.get('format', 'html'),
-                        "encoding": note.get('encoding', 'UTF-8'),
-                        "status": note.get('status', 'active'),
-                        "version": note.get('version', 1)
-                    }
-                    results.append(note_data)
-                    
-                    # Update local cache
-                    self._notes_by_guid[note_data['guid']] = note_data
-                    if note_data['tags']:
-                        self._tags.update(note_data['tags'])
-                        
-                # Update local collection cache
-                self.lists[collection] = results
-                return results
+                notes = self._apply_folder_notes(collection, collection_guid, response)
+                return [note.to_dict() for note in notes]
 
             # Fallback to local cache if server request fails
-            return self.lists.get(collection, [])
+            return self.notes_in_folder(collection)
 
         except NonRetryableError as e:
-            logger.error(f"Failed to get notes by collection: {str(e)}")
+            logger.error("Failed to get notes by collection: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error getting notes by collection: {str(e)}")
+            logger.error("Unexpected error getting notes by collection: %s", e)
             
         return []
 
-    def search(self, query: str) -> List[Dict]:
-        """Search notes."""
+    def notes_in_folder(self, folder: str) -> List[Dict]:
+        """Return copies of the cached notes of a folder as a list."""
+        return [note.to_dict() for note in self.lists.get(folder, {}).values()]
+
+    def search_local(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """Search the cached notes for those whose title or tags contain every word of query.
+
+        Whole words are matched, ignoring case, from an index kept up to date
+        as notes are cached, so no request is made.
+        """
+        guids = None
+        for token in _tokens(query):
+            matches = self._notes_by_token.get(token)
+            if not matches:
+                return []
+            guids = set(matches) if guids is None else guids & matches
+        if not guids:
+            return []
+        return [self._notes_by_guid[guid].to_dict() for guid in islice(guids, limit)]
+
+    def get_notes_by_tag(self, tag: str) -> List[Dict]:
+        """Get copies of the cached notes carrying a tag, ignoring case."""
+        return [
+            self._notes_by_guid[guid].to_dict()
+            for guid in self._notes_by_tag.get(tag.casefold(), ())
+        ]
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """Search notes, returning at most limit results.
+
+        Server results are cached per query until a note is created, changed
+        or removed; results of the local fallback are not cached.
+        """
+        cache_key = (query, limit)
+        with self._search_cache_lock:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                self._search_cache.move_to_end(cache_key)
+                return _copy_results(cached)
+            generation = self._search_generation
+        results, from_server = self._search(query, limit)
+        if from_server:
+            with self._search_cache_lock:
+                if generation == self._search_generation:
+                    self._search_cache[cache_key] = results
+                    if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+                        self._search_cache.popitem(last=False)
+            return _copy_results(results)
+        return results
+
+    def _search(self, query: str, limit: int) -> Tuple[List[Dict], bool]:
+        """Run a search on the server, falling back to the cached notes if it fails.
+
+        Results are plain dicts of the same fields either way. Returns them
+        with whether they came from the server.
+        """
         try:
             # Format the search request with proper parameters
             search_data = {
-                "requestID": str(uuid.uuid4()).upper(),
-                "schema": "chunked:3",  # Updated schema version
-                "_cloudKitVersion": "3",  # Updated CloudKit version
+                **_BODY_BASE,  # requestID is stamped by _prepare_request
                 "query": {
                     "text": query.lower(),
                     "fields": ["title", "content", "tags"],
@@ -709,71 +2031,51 @@ class NotesService:
                         "caseSensitive": False,
                         "includeDeleted": False,
                         "includeShared": True,
-                        "maxResults": 100
-                    }
-                }
+                        "maxResults": limit,
+                        "offset": 0,
+                    },
+                },
             }
 
-            response = self._make_request(
-                "post",
-                "/no/search",
-                data=search_data,
-                timeout=REQUEST_TIMEOUT
+            response = self._post_json(
+                "/no/search", data=search_data, timeout=REQUEST_TIMEOUT
             )
 
-            if response and 'notes' in response:
-                results = []
-                for note in response['notes']:
-                    note_data = {
-                        "guid": note.get('identifier') or note.get('noteGuid'),
-                        "title": note.get('title') or note.get('subject', ''),
-                        "folder": note.get('folderName', '/'),
-                        "size": note.get('contentLength') or note.get('size', 0),
-                        "modified": note.get('lastModifiedDate'),
-                        "content": note.get('content'),
-                        "tags": note.get('tags', []),
-                        "created": note.get('createdDate'),
-                        "isShared": note.get('isShared', False),
-                        "hasAttachments": note.get('hasAttachments', False),
-                        "format": note.get('format', 'html'),
-                        "encoding": note.get('encoding', 'UTF-8'),
-                        "status": note.get('status', 'active'),
-                        "version": note.get('version', 1)
-                    }
-                    results.append(note_data)
-                return results
+            if response and "notes" in response:
+                notes = response["notes"]
+                results = list(map(_extract, notes))
+                for note, note_data in zip(notes, results):
+                    note_data["folder"] = note.get("folderName", "/")
+                    note_data["tags"] = note.get("tags", [])
+                return results, True
 
-            # Fallback to local search if server search fails
-            query = query.lower()
+            # Fallback to local search if server search fails; the whole query is one substring
+            needles = [query.casefold()]
+            table = self._notes_table or self._build_notes_table()
             return [
-                note for note in self._notes_by_guid.values()
-                if query in note.get('title', '').lower()
-                or query in note.get('content', '').lower()
-                or any(query in tag.lower() for tag in note.get('tags', []))
-            ]
+                _search_result(self._notes_by_guid[table.guids[row]])
+                for row in table.match(needles)[:limit]
+            ], False
 
         except NonRetryableError as e:
-            logger.error(f"Failed to search notes: {str(e)}")
+            logger.error("Failed to search notes: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error searching notes: {str(e)}")
+            logger.error("Unexpected error searching notes: %s", e)
             
-        return []
+        return [], False
 
     def create_folder(self, name: str) -> bool:
         """Create a new folder in Notes."""
         try:
-            now = datetime.now()
-            local_tz = pytz.timezone(get_localzone_name())
-            now_local = now.astimezone(local_tz)
-            folder_id = str(uuid.uuid4()).upper()
+            now_local = self._now_local()
+            identifier = str(uuid.uuid4()).upper()
+            folder_guid = str(uuid.uuid4()).upper()
             
             folder_data = {
-                "requestID": str(uuid.uuid4()).upper(),
-                "schema": "chunked:3",  # Updated schema version
-                "_cloudKitVersion": "3",  # Updated CloudKit version
+                **_BODY_BASE,  # requestID is stamped by _prepare_request
                 "folder": {
-                    "identifier": str(uuid.uuid4()).upper(),
-                    "folderGuid": str(uuid.uuid4()).upper(),
+                    "identifier": identifier,
+                    "folderGuid": folder_guid,
                     "name": name,
                     "type": "folder",
                     "parentGuid": "root",
@@ -781,13 +2083,12 @@ class NotesService:
                     "version": 1,
                     "isShared": False,
                     "status": "active",
-                    "createdDate": now_local.strftime("%Y-%m-%dT%H:%M:%S.%f%z"),
-                    "lastModifiedDate": now_local.strftime("%Y-%m-%dT%H:%M:%S.%f%z")
-                }
+                    "createdDate": now_local,
+                    "lastModifiedDate": now_local,
+                },
             }
 
-            response = self._make_request(
-                "POST",
+            response = self._post_json(
                 "/no/folders",
                 data=folder_data,
                 timeout=REQUEST_TIMEOUT
@@ -810,12 +2111,58 @@ class NotesService:
                     "createdDate": response['folder'].get('createdDate'),
                     "lastModifiedDate": response['folder'].get('lastModifiedDate')
                 }
-                self.lists[name] = []
+                self.lists[name] = {}
                 return True
 
         except NonRetryableError as e:
-            logger.error(f"Failed to create folder: {str(e)}")
+            logger.error("Failed to create folder: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected error creating folder: {str(e)}")
+            logger.error("Unexpected error creating folder: %s", e)
             
         return False 
+
+    async def _in_pool(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking method on the worker pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, lambda: func(*args, **kwargs))
+
+    async def acreate(
+        self,
+        title: str,
+        body: str,
+        collection: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        pguid: Optional[str] = None,
+    ) -> Optional[str]:
+        """Async variant of create()."""
+        return await self._in_pool(
+            self.create, title, body, collection=collection, tags=tags, pguid=pguid
+        )
+
+    async def aget_note(
+        self, note_id: str, use_cache: bool = True, max_age: float = NOTE_MAX_AGE
+    ) -> Optional[Dict]:
+        """Async variant of get_note()."""
+        return await self._in_pool(
+            self.get_note, note_id, use_cache=use_cache, max_age=max_age
+        )
+
+    async def aupdate(
+        self,
+        note_id: str,
+        title: Optional[str] = None,
+        body: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """Async variant of update()."""
+        return await self._in_pool(
+            self.update, note_id, title=title, body=body, tags=tags
+        )
+
+    async def adelete_note(self, note_id: str) -> bool:
+        """Async variant of delete_note()."""
+        return await self._in_pool(self.delete_note, note_id)
+
+    async def asearch(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """Async variant of search()."""
+        return await self._in_pool(self.search, query, limit)
@@ -1,6 +1,8 @@
 """Reminders service."""
 from datetime import datetime, timedelta
+from functools import lru_cache
 import time
+import random
 import uuid
 import json
 import logging
@@ -10,8 +12,14 @@ from collections import defaultdict
 from pyicloud.exceptions import PyiCloudException, PyiCloudAPIResponseException
 import pytz
 import sys
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    import orjson
+except ImportError:  # Optional faster JSON codec
+    orjson = None
+
 if sys.platform == 'darwin':
     from Foundation import (
         NSDate, NSDateComponents, NSCalendar,
@@ -26,6 +34,18 @@ if sys.platform == 'darwin':
 
 LOGGER = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=None)
+def _local_tz_name() -> str:
+    """Return the local timezone name, read from the system once per process."""
+    return get_localzone_name()
+
+
+def _date_key(date: datetime) -> int:
+    """Return the YYYYMMDD integer that leads an API date list."""
+    return date.year * 10000 + date.month * 100 + date.day
+
+
 class WebRemindersService:
     """iCloud web API implementation of reminders."""
     
@@ -78,6 +98,36 @@ AUTH_TOKEN_EXPIRY = 3600  # 1 hour
 BATCH_SIZE = 20
 REQUEST_TIMEOUT = 30
 MAX_BATCH_RETRIES = 3
+_BACKOFF_BASE = 0.5  # Seconds before the first retry, before jitter
+_BACKOFF_CAP = 8.0
+_RETRY_AFTER_CAP = 5.0  # Longest Retry-After honoured, in seconds
+
+
+def _backoff(attempt: int) -> float:
+    """Return the delay before retry number attempt: capped exponential with jitter."""
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt) * (0.5 + random.random())
+
+
+def _retry_after(response, attempt: int) -> float:
+    """Return how long to wait before retrying a 503, honouring a capped Retry-After."""
+    try:
+        return min(float(response.headers["Retry-After"]), _RETRY_AFTER_CAP)
+    except (KeyError, ValueError):  # Absent, or in HTTP-date form
+        return _backoff(attempt)
+
+
+if orjson is not None:
+    _jdumps = orjson.dumps
+else:
+    _encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def _jdumps(obj) -> bytes:
+        """Serialize a request body to UTF-8 JSON bytes."""
+        return _encode(obj).encode("utf-8")
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class Priority:
     """Priority levels for reminders"""
@@ -117,15 +167,18 @@ class EventKitRemindersService:
         self.store = EKEventStore.alloc().init()
         self._verify_authorization()
         self._calendars = None
+        # Calendar title -> EKCalendar, rebuilt by refresh()
+        self._calendars_by_title = {}
         self.refresh()
-        
+
     def _verify_authorization(self):
         """Verify we have permission to access Reminders."""
-        auth_status = EKEventStore.authorizationStatusForEntityType_(EKEntityTypeReminder)
+        auth_status = EKEventStore.authorizationStatusForEntityType_(
+            EKEntityTypeReminder
+        )
         if auth_status == 0:  # Not determined
             success = self.store.requestAccessToEntityType_completion_(
-                EKEntityTypeReminder,
-                lambda granted, error: None
+                EKEntityTypeReminder, lambda granted, error: None
             )
             if not success:
                 raise PyiCloudException("Failed to request Reminders access")
@@ -135,16 +188,19 @@ class EventKitRemindersService:
             )
 
     def _calendar_for_name(self, name):
-        """Get calendar by name."""
-        calendars = self.store.calendarsForEntityType_(EKEntityTypeReminder)
-        for calendar in calendars:
-            if calendar.title() == name:
-                return calendar
-        return None
+        """Get calendar by name, re-reading the calendars once if it is unknown."""
+        calendar = self._calendars_by_title.get(name)
+        if calendar is None:
+            self.refresh()
+            calendar = self._calendars_by_title.get(name)
+        return calendar
 
     def refresh(self, force=False):
         """Refresh calendars from EventKit."""
         self._calendars = self.store.calendarsForEntityType_(EKEntityTypeReminder)
+        self._calendars_by_title = {
+            str(calendar.title()): calendar for calendar in self._calendars
+        }
         return True
 
     @property
@@ -189,17 +245,22 @@ class EventKitRemindersService:
 
     def _convert_reminder_to_dict(self, reminder: EKReminder) -> Dict:
         """Convert an EKReminder object to our standard dictionary format."""
+        # Every accessor is an Objective-C message send, so each is made once
+        notes = reminder.notes()
+        priority = reminder.priority()
+        calendar = reminder.calendar()
         result = {
-            'guid': str(reminder.calendarItemIdentifier()),
-            'title': str(reminder.title()),
-            'desc': str(reminder.notes()) if reminder.notes() else '',
-            'completed': bool(reminder.completionDate()),
-            'collection': str(reminder.calendar().title()),
-            'priority': int(reminder.priority()) if reminder.priority() else 0,
-            'p_guid': str(reminder.calendar().calendarIdentifier())
+            "guid": str(reminder.calendarItemIdentifier()),
+            "title": str(reminder.title()),
+            "desc": str(notes) if notes else "",
+            "completed": bool(reminder.completionDate()),
+            "collection": str(calendar.title()),
+            "priority": int(priority) if priority else 0,
+            "p_guid": str(calendar.calendarIdentifier()),
         }
 
-        if reminder.dueDateComponents():
+        components = reminder.dueDateComponents()
+        if components:
             try:
                 # Get the date directly from NSDate
                 date = reminder.dueDate()
@@ -440,10 +501,9 @@ class EventKitRemindersService:
             return self._calendars[0].title()
             
         # Verify collection exists
-        for calendar in self._calendars:
-            if calendar.title() == collection:
-                return collection
-                
+        if collection in self._calendars_by_title:
+            return collection
+
         # Collection not found, use first available
         LOGGER.warning(
             "Collection %s not found, using default collection %s",
@@ -530,6 +590,7 @@ class RemindersService:
         self.params = params
         self._service_root = service_root
         self.token_expiry = 0  # Initialize token expiry
+        self._auth_lock = threading.Lock()  # Serializes token refreshes
         
         # Use EventKit on macOS
         if sys.platform == 'darwin':
@@ -619,52 +680,66 @@ class RemindersService:
 
     def _authenticate_before_request(self) -> bool:
         """Only refresh auth token if expired."""
-        now = time.time()
-        if now < self.token_expiry:
-            return True
-            
-        try:
-            # Force authentication refresh for reminders service
-            self.session.service.authenticate(True, "reminders")
-            
-            # Update headers with new tokens
-            self.session.headers.update({
-                "Origin": "https://www.icloud.com",
-                "Referer": "https://www.icloud.com/reminders/",
-                "Accept": "application/json, text/plain, */*",
-                "Accept-Language": "en-US,en;q=0.9",
-                "X-Requested-With": "XMLHttpRequest",
-                "X-Apple-Service": "reminders",
-                "X-Apple-Auth-Token": self.session.service.session_data.get("session_token"),
-                "X-Apple-Domain-Id": "reminders",
-                "X-Apple-I-FD-Client-Info": "{\"app\":{\"name\":\"reminders\",\"version\":\"2.0\"}}",
-                "X-Apple-App-Version": "2.0",
-                "X-Apple-Web-Session-Token": self.session.service.session_data.get("session_token"),
-                "Content-Type": "application/json",
-                "X-Apple-I-TimeZone": get_localzone_name(),
-                "X-Apple-I-ClientTime": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            })
-            
-            # Update service-specific parameters
-            self.params.update({
-                "clientBuildNumber": "2023Project70",
-                "clientMasteringNumber": "2023B70",
-                "clientId": self.session.service.client_id,
-                "dsid": self.session.service.data.get("dsInfo", {}).get("dsid"),
-                "lang": "en-us",
-                "usertz": get_localzone_name(),
-                "remindersWebUIVersion": "2.0",
-            })
-            
-            self.token_expiry = now + AUTH_TOKEN_EXPIRY
+        if time.time() < self.token_expiry:
             return True
-            
-        except Exception as e:
-            LOGGER.error("Failed to refresh auth token: %s", str(e))
-            # Add exponential backoff for auth failures
-            retry_after = min(int(time.time() - self.token_expiry), 30)  # Cap at 30 seconds
-            time.sleep(retry_after)
-            return False
+
+        # One thread refreshes; the rest reuse its token once the lock frees
+        with self._auth_lock:
+            now = time.time()
+            if now < self.token_expiry:
+                return True
+
+            try:
+                # Force authentication refresh for reminders service
+                self.session.service.authenticate(True, "reminders")
+
+                # Update headers with new tokens
+                self.session.headers.update(
+                    {
+                        "Origin": "https://www.icloud.com",
+                        "Referer": "https://www.icloud.com/reminders/",
+                        "Accept": "application/json, text/plain, */*",
+                        "Accept-Language": "en-US,en;q=0.9",
+                        "X-Requested-With": "XMLHttpRequest",
+                        "X-Apple-Service": "reminders",
+                        "X-Apple-Auth-Token": self.session.service.session_data.get(
+                            "session_token"
+                        ),
+                        "X-Apple-Domain-Id": "reminders",
+                        "X-Apple-I-FD-Client-Info": '{"app":{"name":"reminders","version":"2.0"}}',
+                        "X-Apple-App-Version": "2.0",
+                        "X-Apple-Web-Session-Token": self.session.service.session_data.get(
+                            "session_token"
+                        ),
+                        "Content-Type": "application/json",
+                        "X-Apple-I-TimeZone": _local_tz_name(),
+                        "X-Apple-I-ClientTime": datetime.now().strftime(
+                            "%Y-%m-%dT%H:%M:%SZ"
+                        ),
+                    }
+                )
+
+                # Update service-specific parameters
+                self.params.update(
+                    {
+                        "clientBuildNumber": "2023Project70",
+                        "clientMasteringNumber": "2023B70",
+                        "clientId": self.session.service.client_id,
+                        "dsid": self.session.service.data.get("dsInfo", {}).get("dsid"),
+                        "lang": "en-us",
+                        "usertz": _local_tz_name(),
+                        "remindersWebUIVersion": "2.0",
+                    }
+                )
+
+                self.token_expiry = now + AUTH_TOKEN_EXPIRY
+                return True
+
+            except Exception as e:
+                LOGGER.error("Failed to refresh auth token: %s", str(e))
+                # Short jittered pause; _make_request() bounds the attempts
+                time.sleep(_backoff(0))
+                return False
 
     def _batch_request(self, operations: List[Dict[str, Any]], force: bool = False) -> bool:
         """Execute batch operations efficiently."""
@@ -728,17 +803,16 @@ class RemindersService:
             if not self._authenticate_before_request():
                 retry_count += 1
                 if retry_count == max_retries:
-                    raise NonRetryableError("Failed to authenticate after multiple attempts")
+                    raise NonRetryableError(
+                        "Failed to authenticate after multiple attempts"
+                    )
                 continue
-                
+
             try:
-                LOGGER.debug(f"Making {method} request to {endpoint}")
-                request_params = {**self.params, **(params or {})}
-                
+                request_params = {**self.params, **params} if params else self.params
+
                 url = f"{self._service_root}{endpoint}"
-                LOGGER.debug("Making request - URL: %s, method: %s, params: %s, data: %s",
-                           url, method, request_params, data)
-                LOGGER.debug("Auth token: %s", self.session.service.session_data.get("session_token"))
+                LOGGER.debug("Making %s request to %s", method, url)
 
                 if method.lower() == 'get':
                     response = self.session.get(
@@ -749,18 +823,19 @@ class RemindersService:
                 else:
                     response = self.session.post(
                         url,
-                        json=data,  # Changed to use json parameter
+                        data=_jdumps(data) if data is not None else None,
+                        headers=_JSON_HEADERS,
                         params=request_params,
-                        timeout=timeout
+                        timeout=timeout,
                     )
-                
+
                 LOGGER.debug("Response status: %d", response.status_code)
-                LOGGER.debug("Response headers: %s", response.headers)
-                LOGGER.debug("Response body: %s", response.text)
-                
+
                 # Handle different error cases
-                if response.status_code == 401:
-                    LOGGER.debug("Got 401, attempting auth refresh")
+                if response.status_code in (401, 421):
+                    LOGGER.debug(
+                        "Got %d, attempting auth refresh", response.status_code
+                    )
                     self.token_expiry = 0  # Force auth refresh
                     retry_count += 1
                     continue
@@ -773,8 +848,10 @@ class RemindersService:
                     
                 elif response.status_code == 503:
                     # Service unavailable - retry with backoff
-                    retry_after = min(int(response.headers.get('Retry-After', 2)), 5)  # Cap at 5 seconds
-                    LOGGER.warning("Got 503, waiting %d seconds before retry", retry_after)
+                    retry_after = _retry_after(response, retry_count)
+                    LOGGER.warning(
+                        "Got 503, waiting %.1f seconds before retry", retry_after
+                    )
                     time.sleep(retry_after)
                     retry_count += 1
                     continue
@@ -789,13 +866,15 @@ class RemindersService:
                 response.raise_for_status()
                 return response.json()
                 
+            except NonRetryableError:
+                raise
             except Exception as e:
                 last_error = e
                 LOGGER.error("Request failed - URL: %s, method: %s, params: %s, error: %s",
                            url, method, request_params, str(e))
                 retry_count += 1
                 if retry_count < max_retries:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
+                    time.sleep(_backoff(retry_count))
                     continue
                 raise NonRetryableError(f"Request failed after {max_retries} retries: {str(e)}")
                 
@@ -819,44 +898,35 @@ class RemindersService:
         if not due_date:
             return None
             
-        if not due_date.tzinfo:
-            # Assume local timezone if not specified
-            local_tz = pytz.timezone('America/Los_Angeles')  # Adjust as needed
-            due_date = local_tz.localize(due_date)
-            
-        # Convert to UTC for API
-        utc_date = due_date.astimezone(pytz.UTC)
-        
         # Format as required by the API
         return {
-            "dueDate": [
-                int(f"{utc_date.year}{utc_date.month:02d}{utc_date.day:02d}"),
-                utc_date.year,
-                utc_date.month,
-                utc_date.day,
-                utc_date.hour,
-                utc_date.minute,
-                utc_date.second
-            ],
+            "dueDate": self._format_date(due_date),
             "dueDateIsAllDay": False,
             "dueDateTz": "UTC"
         }
 
     def get_reminders_by_priority(self, min_priority: int = Priority.NONE,
                                 include_completed: bool = False) -> List[Dict]:
-        """Get reminders filtered by minimum priority level."""
+        """Get copies of the reminders at or above a priority level."""
         reminders = []
         for collection in self.lists.values():
             for reminder in collection:
-                if (reminder.get("priority", Priority.NONE) >= min_priority and
-                    (include_completed or not reminder["completed"])):
-                    reminders.append(reminder)
-        return sorted(reminders, key=lambda x: (-x.get("priority", Priority.NONE),
-                                              x.get("due") or datetime.max))
+                if reminder.get("priority", Priority.NONE) >= min_priority and (
+                    include_completed or not reminder["completed"]
+                ):
+                    reminders.append(dict(reminder))
+        return sorted(
+            reminders,
+            key=lambda x: (
+                -x.get("priority", Priority.NONE),
+                x.get("due") or datetime.max,
+            ),
+        )
 
-    def get_reminders_by_tags(self, tags: List[str], match_all: bool = False,
-                            include_completed: bool = False) -> List[Dict]:
-        """Get reminders that match specified tags."""
+    def get_reminders_by_tags(
+        self, tags: List[str], match_all: bool = False, include_completed: bool = False
+    ) -> List[Dict]:
+        """Get copies of the reminders that match specified tags."""
         reminders = []
         tags = set(tags)
         for collection in self.lists.values():
@@ -865,7 +935,7 @@ class RemindersService:
                 if ((match_all and tags.issubset(reminder_tags)) or
                     (not match_all and tags.intersection(reminder_tags)) and
                     (include_completed or not reminder["completed"])):
-                    reminders.append(reminder)
+                    reminders.append(dict(reminder))
         return reminders
 
     def get_all_tags(self) -> List[str]:
@@ -897,7 +967,7 @@ class RemindersService:
             
         utc_date = date.astimezone(pytz.UTC)
         return [
-            int(f"{utc_date.year}{utc_date.month:02d}{utc_date.day:02d}"),
+            _date_key(utc_date),
             utc_date.year,
             utc_date.month,
             utc_date.day,
@@ -927,10 +997,6 @@ class RemindersService:
             if formatted_color.startswith("#"):
                 formatted_color = formatted_color[1:]
 
-            # Get current time in correct format
-            now = datetime.utcnow()
-            timestamp_z = now.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'  # Truncate microseconds to 3 digits
-
             list_data = {
                 "Collection": {
                     "title": name,
@@ -1,15 +1,26 @@
 """Web API-based Reminders service."""
 from datetime import datetime, timedelta
+from functools import lru_cache
 import time
+import random
 import uuid
 import json
 import logging
+import threading
 from tzlocal import get_localzone_name
 from typing import List, Dict, Optional, Union, Tuple, Any
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from pyicloud.exceptions import PyiCloudException
+from pyicloud.utils import SlottedRecord
 import pytz
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON codec
+    orjson = None
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +29,149 @@ AUTH_TOKEN_EXPIRY = 3600  # 1 hour
 BATCH_SIZE = 20
 REQUEST_TIMEOUT = 30
 MAX_BATCH_RETRIES = 3
+BATCH_RATE = 2.0  # Batch POSTs per second, on average
+BATCH_BURST = 2  # Batch POSTs that may go out back to back
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+_VIEW_CACHE_SIZE = 64  # Query results kept between changes to the cache
+_BACKOFF_BASE = 0.5  # Seconds before the first retry, before jitter
+_BACKOFF_CAP = 8.0
+_RETRY_AFTER_CAP = 5.0  # Longest Retry-After honoured, in seconds
+
+
+def _backoff(attempt: int) -> float:
+    """Return the delay before retry number attempt: capped exponential with jitter."""
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt) * (0.5 + random.random())
+
+
+def _retry_after(response, attempt: int) -> float:
+    """Return how long to wait before retrying a 503, honouring a capped Retry-After."""
+    try:
+        return min(float(response.headers["Retry-After"]), _RETRY_AFTER_CAP)
+    except (KeyError, ValueError):  # Absent, or in HTTP-date form
+        return _backoff(attempt)
+
+
+class _TokenBucket:
+    """Rate limiter allowing bursts of up to capacity calls, rate calls per second on average.
+
+    Safe to share between threads; callers that would exceed the rate sleep
+    outside the lock until their turn.
+    """
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_stamp", "_lock")
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, waiting for it if the bucket is empty."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._stamp) * self._rate
+            )
+            self._stamp = now
+            self._tokens -= 1  # May go negative: later callers queue behind this one
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+# Fields of a new reminder that post() always sends with the same value
+_NEW_REMINDER_FIELDS = {
+    "etag": None,
+    "order": 0,
+    "recurrence": None,
+    "dueDateIsAllDay": False,
+    "completed": False,
+    "completedDate": None,
+    "alarms": [],
+    "recurrenceMaster": None,
+    "startDate": None,
+    "startDateTz": None,
+    "startDateIsAllDay": False,
+    "isFamily": False,
+    "hasSubtasks": False,  # New iOS 13+ field
+    "hasAttachments": False,  # New iOS 13+ field
+    "isShared": False,  # New iOS 13+ field
+    "subtaskOrder": [],  # New iOS 13+ field
+    "attachments": [],  # New iOS 13+ field
+    "flagged": False,  # New iOS 13+ field
+    "locationBasedAlerts": False,  # New iOS 13+ field
+}
+
+# Flags sent with every change to an existing reminder, with their defaults
+_TASK_FLAG_DEFAULTS = (
+    ("hasSubtasks", False),
+    ("hasAttachments", False),
+    ("isShared", False),
+    ("flagged", False),
+    ("locationBasedAlerts", False),
+    ("subtaskOrder", []),
+    ("attachments", []),
+)
+
+if orjson is not None:
+    _jdumps = orjson.dumps
+else:
+    _encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def _jdumps(obj) -> bytes:
+        """Serialize a request body to UTF-8 JSON bytes."""
+        return _encode(obj).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _local_tz_name() -> str:
+    """Return the local timezone name, read from the system once per process."""
+    return get_localzone_name()
+
+
+@lru_cache(maxsize=None)
+def _local_tz():
+    """Return the pytz timezone used to localize naive due dates."""
+    return pytz.timezone(_local_tz_name())
+
+
+class Reminder(SlottedRecord):
+    """A cached reminder, with the fields every reminder has kept in slots.
+
+    ``due`` and ``completed`` always exist (None and False unless set), so
+    the query paths read them as attributes, e.g. ``reminder.due``. Only
+    the service's caches hold these; the getters return ``to_dict()``
+    copies.
+    """
+
+    # Reminder key -> slot name
+    _SLOTS = {
+        "guid": "guid",
+        "title": "title",
+        "desc": "desc",
+        "due": "due",
+        "completed": "completed",
+        "completedDate": "completed_date",
+        "collection": "collection",
+        "priority": "priority",
+        "tags": "tags",
+        "p_guid": "p_guid",
+        "hasSubtasks": "has_subtasks",
+        "hasAttachments": "has_attachments",
+        "isShared": "is_shared",
+        "flagged": "flagged",
+    }
+
+    __slots__ = tuple(_SLOTS.values())
+
+    def __init__(self, fields: Optional[Dict] = None):
+        self.due = None
+        self.completed = False
+        super().__init__(fields)
+
 
 class Priority:
     """Priority levels for reminders"""
@@ -58,6 +212,7 @@ class WebRemindersService:
         self.session = session
         self.params = params
         self.token_expiry = 0
+        self._auth_lock = threading.Lock()
         self._service_root = service_root
         self._reminders_endpoint = "%s/rd" % self._service_root
         self._reminders_startup_url = "%s/startup" % self._reminders_endpoint
@@ -67,6 +222,7 @@ class WebRemindersService:
         self._retry_delay = 1  # Reduced from 2
         self._batch_size = BATCH_SIZE
         self._pending_operations = []
+        self._rate_limiter = _TokenBucket(BATCH_RATE, BATCH_BURST)  # Paces batch POSTs
         self._last_refresh = 0
         self._refresh_interval = 300  # 5 minutes
         
@@ -75,77 +231,99 @@ class WebRemindersService:
         self.collections = {}
         self._reminders_by_guid = {}
         self._tags = set()
-        
+        self._views = {}  # Query key -> result list, dropped by _changed()
+        self._url_cache = {}  # Endpoint -> absolute URL
+
+        # Keep warm connections to the reminders host for concurrent requests
+        self.session.mount(
+            service_root,
+            HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                pool_block=False,
+                max_retries=getattr(session, "retry_strategy", 0),
+            ),
+        )
+
         # Add service-specific headers for iOS 13+ format
-        self.session.headers.update({
-            "Origin": "https://www.icloud.com",
-            "Referer": "https://www.icloud.com/reminders/",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "X-Requested-With": "XMLHttpRequest",
-            "X-Apple-Service": "reminders",
-            "X-Apple-Auth-Token": session.service.session_data.get("session_token"),
-            "X-Apple-Domain-Id": "reminders",
-            "X-Apple-I-FD-Client-Info": "{\"app\":{\"name\":\"reminders\",\"version\":\"2.0\"}}",  # Updated version
-            "X-Apple-App-Version": "2.0",  # Updated version
-            "X-Apple-Web-Session-Token": session.service.session_data.get("session_token"),
-            "Content-Type": "application/json",
-            "X-Apple-I-TimeZone": get_localzone_name(),  # Added timezone
-            "X-Apple-I-ClientTime": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),  # Added client time
-        })
-        
-        # Add service-specific parameters for iOS 13+ format
-        self.params.update({
+        self.session.headers.update(
+            {
+                "Origin": "https://www.icloud.com",
+                "Referer": "https://www.icloud.com/reminders/",
+                "Accept": "application/json, text/plain, */*",
+                "Accept-Language": "en-US,en;q=0.9",
+                "X-Requested-With": "XMLHttpRequest",
+                "X-Apple-Service": "reminders",
+                "X-Apple-Auth-Token": session.service.session_data.get("session_token"),
+                "X-Apple-Domain-Id": "reminders",
+                "X-Apple-I-FD-Client-Info": '{"app":{"name":"reminders","version":"2.0"}}',  # Updated version
+                "X-Apple-App-Version": "2.0",  # Updated version
+                "X-Apple-Web-Session-Token": session.service.session_data.get(
+                    "session_token"
+                ),
+                "Content-Type": "application/json",
+                "X-Apple-I-TimeZone": _local_tz_name(),  # Added timezone
+                "X-Apple-I-ClientTime": datetime.now().strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),  # Added client time
+            }
+        )
+
+        # Add service-specific parameters for iOS 13+ format; none of them
+        # change on re-authentication, so they are built once here
+        self._static_params = {
             "clientBuildNumber": "2023Project70",  # Updated build number
             "clientMasteringNumber": "2023B70",    # Updated mastering number
             "clientId": session.service.client_id,
             "dsid": session.service.data.get("dsInfo", {}).get("dsid"),
             "lang": "en-us",
-            "usertz": get_localzone_name(),
+            "usertz": _local_tz_name(),
             "remindersWebUIVersion": "2.0",  # Updated version
-        })
+        }
+        self.params.update(self._static_params)
         
         # Initial refresh
         self.refresh()
 
     def _authenticate_before_request(self) -> bool:
         """Authenticate before making a request."""
-        now = time.time()
-        if now < self.token_expiry:
-            return True
-            
-        try:
-            # Force authentication refresh
-            self.session.service.authenticate(True, "reminders")
-            
-            # Update service-specific headers
-            self.session.headers.update({
-                "X-Apple-Auth-Token": self.session.service.session_data.get("session_token"),
-                "X-Apple-Web-Session-Token": self.session.service.session_data.get("session_token"),
-                "X-Apple-I-TimeZone": get_localzone_name(),
-                "X-Apple-I-ClientTime": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            })
-            
-            # Update service-specific parameters
-            self.params.update({
-                "clientBuildNumber": "2023Project70",
-                "clientMasteringNumber": "2023B70",
-                "clientId": self.session.service.client_id,
-                "dsid": self.session.service.data.get("dsInfo", {}).get("dsid"),
-                "lang": "en-us",
-                "usertz": get_localzone_name(),
-                "remindersWebUIVersion": "2.0",
-            })
-            
-            self.token_expiry = now + AUTH_TOKEN_EXPIRY
+        if time.time() < self.token_expiry:
             return True
-            
-        except Exception as e:
-            LOGGER.error("Failed to refresh auth token: %s", str(e))
-            # Add exponential backoff for auth failures
-            retry_after = min(int(time.time() - self.token_expiry), 30)  # Cap at 30 seconds
-            time.sleep(retry_after)
-            return False
+
+        # One thread refreshes; the rest reuse its token once the lock frees
+        with self._auth_lock:
+            now = time.time()
+            if now < self.token_expiry:
+                return True
+
+            try:
+                # Force authentication refresh
+                self.session.service.authenticate(True, "reminders")
+
+                # Update service-specific headers
+                session_token = self.session.service.session_data.get("session_token")
+                self.session.headers.update(
+                    {
+                        "X-Apple-Auth-Token": session_token,
+                        "X-Apple-Web-Session-Token": session_token,
+                        "X-Apple-I-TimeZone": _local_tz_name(),
+                        "X-Apple-I-ClientTime": datetime.now().strftime(
+                            "%Y-%m-%dT%H:%M:%SZ"
+                        ),
+                    }
+                )
+
+                # Restore the service parameters in case authentication reset them
+                self.params.update(self._static_params)
+
+                self.token_expiry = now + AUTH_TOKEN_EXPIRY
+                return True
+
+            except Exception as e:
+                LOGGER.error("Failed to refresh auth token: %s", str(e))
+                # Short jittered pause; _make_request() bounds the attempts
+                time.sleep(_backoff(0))
+                return False
 
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
                      params: Optional[Dict] = None, timeout: int = REQUEST_TIMEOUT) -> Optional[Any]:
@@ -162,26 +340,29 @@ class WebRemindersService:
                 continue
                 
             try:
-                LOGGER.debug(f"Making {method} request to {endpoint}")
-                request_params = {**self.params, **(params or {})}
-                
-                if method.lower() == 'get':
+                LOGGER.debug("Making %s request to %s", method, endpoint)
+                request_params = {**self.params, **params} if params else self.params
+                url = self._url_cache.get(endpoint)
+                if url is None:
+                    url = self._url_cache[endpoint] = f"{self._service_root}{endpoint}"
+
+                if method.lower() == "get":
                     response = self.session.get(
-                        f"{self._service_root}{endpoint}",
-                        params=request_params,
-                        timeout=timeout
+                        url, params=request_params, timeout=timeout
                     )
                 else:
                     response = self.session.post(
-                        f"{self._service_root}{endpoint}",
-                        data=json.dumps(data) if data else None,
+                        url,
+                        data=_jdumps(data) if data else None,
                         params=request_params,
-                        timeout=timeout
+                        timeout=timeout,
                     )
-                    
+
                 # Handle different error cases
-                if response.status_code == 401:
-                    LOGGER.debug("Got 401, attempting auth refresh")
+                if response.status_code in (401, 421):
+                    LOGGER.debug(
+                        "Got %d, attempting auth refresh", response.status_code
+                    )
                     self.token_expiry = 0  # Force auth refresh
                     retry_count += 1
                     continue
@@ -194,8 +375,10 @@ class WebRemindersService:
                     
                 elif response.status_code == 503:
                     # Service unavailable - retry with backoff
-                    retry_after = min(int(response.headers.get('Retry-After', 2)), 5)  # Cap at 5 seconds
-                    LOGGER.warning("Got 503, waiting %d seconds before retry", retry_after)
+                    retry_after = _retry_after(response, retry_count)
+                    LOGGER.warning(
+                        "Got 503, waiting %.1f seconds before retry", retry_after
+                    )
                     time.sleep(retry_after)
                     retry_count += 1
                     continue
@@ -210,12 +393,14 @@ class WebRemindersService:
                 response.raise_for_status()
                 return response.json()
                 
+            except NonRetryableError:
+                raise
             except Exception as e:
                 last_error = e
                 LOGGER.error(f"Request failed: {str(e)}")
                 retry_count += 1
                 if retry_count < max_retries:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
+                    time.sleep(_backoff(retry_count))
                     continue
                 raise NonRetryableError(str(e))
                 
@@ -242,52 +427,60 @@ class WebRemindersService:
             self.collections.clear()
             self._reminders_by_guid.clear()
             self._tags.clear()
+            self._changed()
 
+            # (title, reminder list) by collection guid, so each reminder
+            # finds its bucket with one lookup; empty lists are kept too
+            buckets = {}
             for collection in data.get("Collections", []):
-                self.collections[collection["title"]] = {
+                title = collection["title"]
+                self.collections[title] = {
                     "guid": collection["guid"],
                     "ctag": collection["ctag"],
                 }
+                buckets[collection["guid"]] = (title, self.lists[title])
                 
+            by_guid = self._reminders_by_guid
+            add_tags = self._tags.update
             for reminder in data.get("Reminders", []):
+                get = reminder.get
                 collection_guid = reminder["pGuid"]
-                collection_title = next(
-                    (title for title, info in self.collections.items() 
-                     if info["guid"] == collection_guid),
-                    None
-                )
+                bucket = buckets.get(collection_guid)
                 
-                if not collection_title:
+                if bucket is None:
                     continue
+                collection_title, items = bucket
 
                 due_date = None
-                if reminder.get("dueDate"):
+                due = get("dueDate")
+                if due:
                     try:
-                        due_date = datetime(
-                            reminder["dueDate"][1],
-                            reminder["dueDate"][2],
-                            reminder["dueDate"][3],
-                            reminder["dueDate"][4],
-                            reminder["dueDate"][5],
+                        # The API sends due dates in UTC; store them aware
+                        due_date = datetime(*due[1:6], tzinfo=pytz.UTC)
+                    except (TypeError, ValueError) as e:
+                        LOGGER.warning(
+                            "Invalid due date for reminder %s: %s", reminder["guid"], e
                         )
-                    except (IndexError, ValueError) as e:
-                        LOGGER.warning(f"Invalid due date for reminder {reminder['guid']}: {e}")
-
-                reminder_data = {
-                    "guid": reminder["guid"],
-                    "title": reminder["title"],
-                    "desc": reminder.get("description"),
-                    "due": due_date,
-                    "completed": reminder.get("completedDate") is not None,
-                    "collection": collection_title,
-                    "priority": reminder.get("priority", 0),
-                    "tags": reminder.get("tags", []),
-                    "p_guid": collection_guid,
-                }
-                
-                self.lists[collection_title].append(reminder_data)
-                self._reminders_by_guid[reminder["guid"]] = reminder_data
-                self._tags.update(reminder_data["tags"])
+
+                guid = reminder["guid"]
+                tags = get("tags", [])
+                reminder_data = Reminder(
+                    {
+                        "guid": guid,
+                        "title": reminder["title"],
+                        "desc": get("description"),
+                        "due": due_date,
+                        "completed": get("completedDate") is not None,
+                        "collection": collection_title,
+                        "priority": get("priority", 0),
+                        "tags": tags,
+                        "p_guid": collection_guid,
+                    }
+                )
+
+                items.append(reminder_data)
+                by_guid[guid] = reminder_data
+                add_tags(tags)
                 
             self._last_refresh = now
             return True
@@ -307,56 +500,50 @@ class WebRemindersService:
             return default_collection
         return collection_name
 
-    def post(self, title: str, description: str = "", collection: Optional[str] = None,
-             priority: int = Priority.NONE, tags: List[str] = None,
-             due_date: Optional[datetime] = None, **kwargs) -> Optional[str]:
-        """Create a new reminder with enhanced features."""
+    def post(
+        self,
+        title: str,
+        description: str = "",
+        collection: Optional[str] = None,
+        priority: int = Priority.NONE,
+        tags: List[str] = None,
+        due_date: Optional[datetime] = None,
+        refresh: bool = False,
+        **kwargs,
+    ) -> Optional[str]:
+        """Create a new reminder with enhanced features.
+
+        The new reminder is added to the local cache from the data that was
+        sent; pass refresh=True to reload everything from the server instead.
+        """
         try:
             collection = self._validate_collection(collection)
             pguid = self.collections[collection]["guid"] if collection in self.collections else "tasks"
 
             new_guid = str(uuid.uuid4())
             now = datetime.now(pytz.UTC)
+            now_ms = int(now.timestamp() * 1000)
             
             # Updated reminder data structure for iOS 13+
             reminder_data = {
                 "fields": {  # New fields wrapper for iOS 13+
+                    **_NEW_REMINDER_FIELDS,
                     "guid": new_guid,
                     "title": title,
                     "description": description or "",
                     "pGuid": pguid,
-                    "etag": None,
-                    "order": 0,
                     "priority": priority,
-                    "recurrence": None,
-                    "createdDateExtended": int(now.timestamp() * 1000),
-                    "lastModifiedDate": int(now.timestamp() * 1000),
-                    "dueDateIsAllDay": False,
+                    "createdDateExtended": now_ms,
+                    "lastModifiedDate": now_ms,
                     "tags": tags or [],
-                    "completed": False,
-                    "completedDate": None,
-                    "alarms": [],
-                    "recurrenceMaster": None,
-                    "startDate": None,
-                    "startDateTz": None,
-                    "startDateIsAllDay": False,
-                    "isFamily": False,
                     "createdDate": self._format_date(now),
-                    "hasSubtasks": False,  # New iOS 13+ field
-                    "hasAttachments": False,  # New iOS 13+ field
-                    "isShared": False,  # New iOS 13+ field
-                    "subtaskOrder": [],  # New iOS 13+ field
-                    "attachments": [],  # New iOS 13+ field
-                    "flagged": False,  # New iOS 13+ field
-                    "locationBasedAlerts": False,  # New iOS 13+ field
                 }
             }
 
             # Add due date if provided
             if due_date:
                 if not due_date.tzinfo:
-                    local_tz = pytz.timezone(get_localzone_name())
-                    due_date = local_tz.localize(due_date)
+                    due_date = _local_tz().localize(due_date)
                 utc_date = due_date.astimezone(pytz.UTC)
                 reminder_data["fields"].update({
                     "dueDate": self._format_date(utc_date),
@@ -371,27 +558,35 @@ class WebRemindersService:
                 timeout=REQUEST_TIMEOUT
             )
 
-            if response and response.status_code == 200:
+            # _make_request() returns the parsed body and raises on HTTP errors
+            if response is not None:
+                if refresh:
+                    self.refresh(force=True)
+                    return new_guid
+
                 # Update local cache
-                cache_data = {
-                    "guid": new_guid,
-                    "title": title,
-                    "desc": description,
-                    "due": due_date,
-                    "completed": False,
-                    "collection": collection,
-                    "priority": priority,
-                    "tags": tags or [],
-                    "p_guid": pguid,
-                    "hasSubtasks": False,
-                    "hasAttachments": False,
-                    "isShared": False,
-                    "flagged": False,
-                }
+                cache_data = Reminder(
+                    {
+                        "guid": new_guid,
+                        "title": title,
+                        "desc": description,
+                        "due": due_date,
+                        "completed": False,
+                        "collection": collection,
+                        "priority": priority,
+                        "tags": tags or [],
+                        "p_guid": pguid,
+                        "hasSubtasks": False,
+                        "hasAttachments": False,
+                        "isShared": False,
+                        "flagged": False,
+                    }
+                )
                 self._reminders_by_guid[new_guid] = cache_data
                 self.lists[collection].append(cache_data)
                 if tags:
                     self._tags.update(tags)
+                self._changed()
                 return new_guid
 
         except NonRetryableError as e:
@@ -402,8 +597,82 @@ class WebRemindersService:
         return None
 
     def get_reminder(self, guid: str) -> Optional[Dict]:
-        """Get a reminder by its GUID."""
-        return self._reminders_by_guid.get(guid)
+        """Get a copy of a reminder by its GUID."""
+        reminder = self._reminders_by_guid.get(guid)
+        return reminder.to_dict() if reminder is not None else None
+
+    def _build_task_payload(self, guid: str, reminder: Dict, fields: Dict) -> Dict:
+        """Build the body of a change to a cached reminder.
+
+        Starts from the reminder's guid, list, title and the flags the API
+        expects on every change, then applies fields on top.
+        """
+        get = reminder.get
+        return {
+            "fields": {
+                "guid": guid,
+                "pGuid": reminder["p_guid"],
+                "title": reminder["title"],
+                **{key: get(key, default) for key, default in _TASK_FLAG_DEFAULTS},
+                **fields,
+            }
+        }
+
+    def _changed(self) -> None:
+        """Drop the cached query results after the cached reminders changed."""
+        self._views.clear()
+
+    def _open_reminders(self, collection_name: str) -> List[Dict]:
+        """Return the collection's reminders that are not completed.
+
+        The list and its reminders are shared through the view cache; hand
+        callers copies made with to_dict().
+        """
+        key = ("collection", collection_name)
+        view = self._views.get(key)
+        if view is None:
+            view = self._remember(
+                key, [r for r in self.lists[collection_name] if not r.completed]
+            )
+        return view
+
+    def _due_index(self) -> Tuple[List[datetime], List[Dict]]:
+        """Return the reminders that have a due date sorted by it, with the sorted dates.
+
+        Built on first use after a change and dropped with the other views.
+        """
+        index = self._views.get("due_index")
+        if index is None:
+            dated = []
+            for reminders in self.lists.values():
+                for reminder in reminders:
+                    due_date = reminder.due
+                    if due_date:
+                        dated.append((due_date, reminder))
+            dated.sort(key=lambda item: item[0])
+            index = ([due for due, _ in dated], [reminder for _, reminder in dated])
+            self._views["due_index"] = index
+        return index
+
+    def _remember(self, key: Tuple, view: List[Dict]) -> List[Dict]:
+        """Cache a query result, evicting the oldest once the cache is full."""
+        views = self._views
+        if len(views) >= _VIEW_CACHE_SIZE:
+            views.pop(next(iter(views)), None)
+        views[key] = view
+        return view
+
+    def _detach(self, reminder: Reminder) -> None:
+        """Remove a reminder from its collection's list.
+
+        Matches by identity; list.remove() would compare every earlier
+        reminder field by field.
+        """
+        items = self.lists[reminder["collection"]]
+        for index, item in enumerate(items):
+            if item is reminder:
+                del items[index]
+                return
 
     def update(self, guid: str, title: Optional[str] = None,
                description: Optional[str] = None, due_date: Optional[datetime] = None,
@@ -422,30 +691,27 @@ class WebRemindersService:
                 pguid = self.collections[collection]["guid"]
 
         # Updated reminder data structure for iOS 13+
-        update_data = {
-            "fields": {
-                "guid": guid,
+        update_data = self._build_task_payload(
+            guid,
+            current,
+            {
                 "pGuid": pguid,
                 "title": title if title is not None else current["title"],
-                "description": description if description is not None else current.get("desc", ""),
-                "priority": priority if priority is not None else current.get("priority", Priority.NONE),
+                "description": description
+                if description is not None
+                else current.get("desc", ""),
+                "priority": priority
+                if priority is not None
+                else current.get("priority", Priority.NONE),
                 "tags": tags if tags is not None else current.get("tags", []),
                 "lastModifiedDate": int(time.time() * 1000),
-                "hasSubtasks": current.get("hasSubtasks", False),
-                "hasAttachments": current.get("hasAttachments", False),
-                "isShared": current.get("isShared", False),
-                "flagged": current.get("flagged", False),
-                "locationBasedAlerts": current.get("locationBasedAlerts", False),
-                "subtaskOrder": current.get("subtaskOrder", []),
-                "attachments": current.get("attachments", []),
-            }
-        }
+            },
+        )
 
         utc_date = None
         if due_date is not None:
             if not due_date.tzinfo:
-                local_tz = pytz.timezone(get_localzone_name())
-                due_date = local_tz.localize(due_date)
+                due_date = _local_tz().localize(due_date)
             utc_date = due_date.astimezone(pytz.UTC)
             update_data["fields"].update({
                 "dueDate": self._format_date(utc_date),
@@ -476,8 +742,7 @@ class WebRemindersService:
             
             # Update collection if changed
             if collection and collection != current["collection"]:
-                old_collection = current["collection"]
-                self.lists[old_collection].remove(current)
+                self._detach(current)
                 self.lists[collection].append(current)
                 current["collection"] = collection
             
@@ -485,111 +750,96 @@ class WebRemindersService:
             if tags:
                 self._tags.update(tags)
             
+            self._changed()
             return True
         return False
 
     def complete(self, guid: str) -> bool:
         """Mark a reminder as completed."""
-        reminder = self.get_reminder(guid)
+        reminder = self._reminders_by_guid.get(guid)
         if not reminder:
             return False
 
-        complete_data = {
-            "fields": {
-                "guid": guid,
-                "pGuid": reminder["p_guid"],
-                "title": reminder["title"],
-                "completedDate": int(time.time() * 1000),
-                "lastModifiedDate": int(time.time() * 1000),
+        now_ms = int(time.time() * 1000)
+        complete_data = self._build_task_payload(
+            guid,
+            reminder,
+            {
+                "completedDate": now_ms,
+                "lastModifiedDate": now_ms,
                 "completed": True,
-                "hasSubtasks": reminder.get("hasSubtasks", False),
-                "hasAttachments": reminder.get("hasAttachments", False),
-                "isShared": reminder.get("isShared", False),
-                "flagged": reminder.get("flagged", False),
-                "locationBasedAlerts": reminder.get("locationBasedAlerts", False),
-                "subtaskOrder": reminder.get("subtaskOrder", []),
-                "attachments": reminder.get("attachments", []),
-            }
-        }
+            },
+        )
 
         success = self._queue_operation(
-            BatchOperation.COMPLETE,
-            complete_data,
-            immediate=True
+            BatchOperation.COMPLETE, complete_data, immediate=True
         )
 
         if success:
             reminder["completed"] = True
-            reminder["completedDate"] = int(time.time() * 1000)
+            reminder["completedDate"] = now_ms
+            self._changed()
             return True
         return False
 
     def get_reminders_by_collection(self, collection_name: str,
                                   include_completed: bool = False) -> List[Dict]:
-        """Get all reminders in a specific collection."""
+        """Get copies of all reminders in a specific collection."""
         if collection_name not in self.lists:
             return []
             
         reminders = self.lists[collection_name]
         if not include_completed:
-            reminders = [r for r in reminders if not r.get("completed")]
-            
-        return reminders
+            reminders = self._open_reminders(collection_name)
 
-    def get_reminders_by_due_date(self, start_date: Optional[datetime] = None,
-                                 end_date: Optional[datetime] = None,
-                                 include_completed: bool = False) -> List[Dict]:
-        """Get reminders due within a date range."""
+        return [reminder.to_dict() for reminder in reminders]
+
+    def get_reminders_by_due_date(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_completed: bool = False,
+    ) -> List[Dict]:
+        """Get copies of the reminders due within a date range."""
         # Ensure dates are timezone-aware
         if start_date and not start_date.tzinfo:
             start_date = start_date.replace(tzinfo=pytz.UTC)
         if end_date and not end_date.tzinfo:
             end_date = end_date.replace(tzinfo=pytz.UTC)
         
-        matching_reminders = []
-        
-        for reminders in self.lists.values():
-            for reminder in reminders:
-                if not include_completed and reminder.get("completed"):
-                    continue
-                    
-                due_date = reminder.get("due")
-                if not due_date:
-                    continue
-                    
-                # Ensure reminder due date is timezone-aware
-                if due_date and not due_date.tzinfo:
-                    due_date = due_date.replace(tzinfo=pytz.UTC)
-                    
-                if start_date and due_date < start_date:
-                    continue
-                if end_date and due_date > end_date:
-                    continue
-                    
-                matching_reminders.append(reminder)
-                
-        return sorted(matching_reminders, key=lambda x: x["due"])
+        key = ("due", start_date, end_date, include_completed)
+        view = self._views.get(key)
+        if view is not None:
+            return [reminder.to_dict() for reminder in view]
+
+        due_dates, reminders = self._due_index()
+        lo = bisect_left(due_dates, start_date) if start_date else 0
+        hi = bisect_right(due_dates, end_date) if end_date else len(due_dates)
+        matching_reminders = reminders[lo:hi]
+        if not include_completed:
+            matching_reminders = [r for r in matching_reminders if not r.completed]
+
+        view = self._remember(key, matching_reminders)
+        return [reminder.to_dict() for reminder in view]
 
     def get_upcoming_reminders(self, days: int = 7,
                              include_completed: bool = False) -> Dict[str, List[Dict]]:
-        """Get reminders due in the next N days, grouped by collection."""
-        start_date = datetime.now()
+        """Get copies of the reminders due in the next N days, grouped by collection."""
+        start_date = datetime.now(pytz.UTC)
         end_date = start_date + timedelta(days=days)
         
         reminders_by_collection = defaultdict(list)
         
-        for collection_name, reminders in self.lists.items():
-            for reminder in reminders:
-                if not include_completed and reminder.get("completed"):
-                    continue
-                    
-                due_date = reminder.get("due")
-                if not due_date:
-                    continue
-                    
-                if start_date <= due_date <= end_date:
-                    reminders_by_collection[collection_name].append(reminder)
-                    
+        # Only the slice of the due-date index inside the window is visited
+        due_dates, reminders = self._due_index()
+        lo = bisect_left(due_dates, start_date)
+        hi = bisect_right(due_dates, end_date)
+        for reminder in reminders[lo:hi]:
+            if include_completed or not reminder.completed:
+                reminders_by_collection[reminder["collection"]].append(
+                    reminder.to_dict()
+                )
+
         return dict(reminders_by_collection)
 
     def move_reminder(self, guid: str, target_collection: str) -> bool:
@@ -603,43 +853,34 @@ class WebRemindersService:
         """Complete multiple reminders in batch."""
         results = {}
         operations = []
+        now_ms = int(time.time() * 1000)
         
         for guid in guids:
-            reminder = self.get_reminder(guid)
+            reminder = self._reminders_by_guid.get(guid)
             if not reminder:
                 results[guid] = False
                 continue
-                
-            complete_data = {
-                "fields": {
-                    "guid": guid,
-                    "pGuid": reminder["p_guid"],
-                    "title": reminder["title"],
-                    "completedDate": int(time.time() * 1000),
-                    "lastModifiedDate": int(time.time() * 1000),
+
+            complete_data = self._build_task_payload(
+                guid,
+                reminder,
+                {
+                    "completedDate": now_ms,
+                    "lastModifiedDate": now_ms,
                     "completed": True,
-                    "hasSubtasks": reminder.get("hasSubtasks", False),
-                    "hasAttachments": reminder.get("hasAttachments", False),
-                    "isShared": reminder.get("isShared", False),
-                    "flagged": reminder.get("flagged", False),
-                    "locationBasedAlerts": reminder.get("locationBasedAlerts", False),
-                    "subtaskOrder": reminder.get("subtaskOrder", []),
-                    "attachments": reminder.get("attachments", []),
-                }
-            }
-            operations.append({
-                "type": BatchOperation.COMPLETE,
-                "data": complete_data
-            })
-            
+                },
+            )
+            operations.append({"type": BatchOperation.COMPLETE, "data": complete_data})
+
         if operations:
             success = self._batch_request(operations)
             if success:
                 for op in operations:
                     guid = op["data"]["fields"]["guid"]
                     self._reminders_by_guid[guid]["completed"] = True
-                    self._reminders_by_guid[guid]["completedDate"] = int(time.time() * 1000)
+                    self._reminders_by_guid[guid]["completedDate"] = now_ms
                     results[guid] = True
+                self._changed()
             else:
                 for op in operations:
                     results[op["data"]["fields"]["guid"]] = False
@@ -654,45 +895,36 @@ class WebRemindersService:
         results = {}
         operations = []
         target_pguid = self.collections[target_collection]["guid"]
+        now_ms = int(time.time() * 1000)
         
         for guid in guids:
-            reminder = self.get_reminder(guid)
+            reminder = self._reminders_by_guid.get(guid)
             if not reminder:
                 results[guid] = False
                 continue
-                
-            move_data = {
-                "fields": {
-                    "guid": guid,
+
+            move_data = self._build_task_payload(
+                guid,
+                reminder,
+                {
                     "pGuid": target_pguid,
-                    "title": reminder["title"],
-                    "lastModifiedDate": int(time.time() * 1000),
-                    "hasSubtasks": reminder.get("hasSubtasks", False),
-                    "hasAttachments": reminder.get("hasAttachments", False),
-                    "isShared": reminder.get("isShared", False),
-                    "flagged": reminder.get("flagged", False),
-                    "locationBasedAlerts": reminder.get("locationBasedAlerts", False),
-                    "subtaskOrder": reminder.get("subtaskOrder", []),
-                    "attachments": reminder.get("attachments", []),
-                }
-            }
-            operations.append({
-                "type": BatchOperation.UPDATE,
-                "data": move_data
-            })
-            
+                    "lastModifiedDate": now_ms,
+                },
+            )
+            operations.append({"type": BatchOperation.UPDATE, "data": move_data})
+
         if operations:
             success = self._batch_request(operations)
             if success:
                 for op in operations:
                     guid = op["data"]["fields"]["guid"]
                     reminder = self._reminders_by_guid[guid]
-                    old_collection = reminder["collection"]
-                    self.lists[old_collection].remove(reminder)
+                    self._detach(reminder)
                     reminder["collection"] = target_collection
                     reminder["p_guid"] = target_pguid
                     self.lists[target_collection].append(reminder)
                     results[guid] = True
+                self._changed()
             else:
                 for op in operations:
                     results[op["data"]["fields"]["guid"]] = False
@@ -702,7 +934,7 @@ class WebRemindersService:
     def _format_date(self, dt: datetime) -> List[int]:
         """Format a datetime object for the API."""
         return [
-            int(f"{dt.year}{dt.month:02d}{dt.day:02d}"),
+            dt.year * 10000 + dt.month * 100 + dt.day,
             dt.year,
             dt.month,
             dt.day,
@@ -737,15 +969,16 @@ class WebRemindersService:
         return success
 
     def _batch_request(self, operations: List[Dict]) -> bool:
-        """Make a batch request."""
+        """Make a batch request, paced by the shared rate limiter."""
         try:
+            self._rate_limiter.acquire()
             response = self._make_request(
                 "post",
                 "/rd/reminders/tasks/batch",
                 data={"operations": operations},
                 timeout=REQUEST_TIMEOUT
             )
-            return response and response.status_code == 200
+            return response is not None
         except Exception as e:
             LOGGER.error(f"Batch request failed: {str(e)}")
             return False 
\ No newline at end of file
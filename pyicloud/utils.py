@@ -9,6 +9,7 @@ import time
 import datetime
 import uuid
 import logging
+from collections.abc import MutableMapping
 import tzlocal
 
 from .exceptions import PyiCloudNoStoredPasswordAvailableException
@@ -19,6 +20,8 @@ TRUST_TOKEN_SYSTEM = "pyicloud://trust-token"
 
 LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 def get_password(username, interactive=sys.stdout.isatty()):
     """Get the password from a username."""
@@ -142,3 +145,96 @@ def get_localzone_name():
     except Exception as err:  # pylint: disable=broad-except
         LOGGER.warning("Could not get local timezone: %s", err)
         return "UTC"
+
+
+class SlottedRecord(MutableMapping):
+    """A mapping that keeps its common fields in slots.
+
+    Subclasses map each common key to a slot name in ``_SLOTS`` and
+    declare ``__slots__ = tuple(_SLOTS.values())``, so a large cache does
+    not pay for a hash table per record. Keys without a slot go to a small
+    overflow dict, and slot-backed fields can also be read as attributes.
+    Records are not dicts; use ``to_dict()`` where a real dict is needed,
+    e.g. for ``json.dumps``.
+    """
+
+    _SLOTS = {}  # Key -> slot name
+    __slots__ = ("_extra",)
+
+    def __init__(self, fields=None):
+        self._extra = None
+        if fields:
+            slots = self._SLOTS
+            for key, value in fields.items():
+                slot = slots.get(key)
+                if slot is not None:
+                    setattr(self, slot, value)
+                else:
+                    self[key] = value
+
+    def __getitem__(self, key):
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            value = getattr(self, slot, _MISSING)
+        elif self._extra is not None:
+            value = self._extra.get(key, _MISSING)
+        else:
+            value = _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        """Return a field's value, or default, without a KeyError round trip."""
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            return getattr(self, slot, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key, value):
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        slot = self._SLOTS.get(key)
+        try:
+            if slot is not None:
+                delattr(self, slot)
+            else:
+                del self._extra[key]
+        except (AttributeError, KeyError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for key, slot in self._SLOTS.items():
+            if hasattr(self, slot):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """Return the record's fields as a plain dict, e.g. for serialization."""
+        fields = {
+            key: getattr(self, slot)
+            for key, slot in self._SLOTS.items()
+            if hasattr(self, slot)
+        }
+        if self._extra:
+            fields.update(self._extra)
+        return fields
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
@@ -0,0 +1,280 @@
+"""Notes service tests."""
+import os
+import threading
+import time
+from copy import deepcopy
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from pyicloud.services import notes
+from pyicloud.services.notes import NonRetryableError, NotesService, _Coalescer
+
+SERVICE_ROOT = "https://p123-notesws.icloud.com"
+
+STARTUP = {
+    "syncToken": "1",
+    "folders": [{"name": "Notes", "identifier": "F1"}],
+    "notes": [
+        {
+            "identifier": "N1",
+            "folderName": "Notes",
+            "title": "Groceries foo-bar",
+            "content": "<p>milk</p>",
+            "modified": "2024-01-01T10:00:00Z",
+        },
+        {
+            "identifier": "N2",
+            "folderName": "Notes",
+            "title": "Plans foo and bar",
+            "modified": "2024-01-01T10:00:00Z",
+        },
+    ],
+}
+
+UNCHANGED = {"syncToken": "1", "notes": [], "folders": []}
+
+TRUNCATED = object()  # Ends a streamed body early
+
+
+@pytest.fixture
+def session(tmp_path):
+    """Create a mock session with a notes-ready login."""
+    session = MagicMock()
+    session.headers = {}
+    session.retry_strategy = 0
+    session.service.data = {"dsInfo": {"dsid": "12345678"}}
+    session.service.session_data = {"session_token": "fake-session-token"}
+    session.service.client_id = "fake-client-id"
+    session.service._cookie_directory = str(tmp_path)
+    return session
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Answer notes requests from canned responses, recording what was asked."""
+    state = {
+        "startup": {"": STARTUP, "1": UNCHANGED},
+        "syncs": [],
+        "bodies": [],
+        "search": None,
+    }
+
+    def get_json(self, endpoint, params=None, timeout=None):
+        state["syncs"].append(params["syncToken"])
+        return deepcopy(state["startup"][params["syncToken"]])
+
+    def post_json(self, endpoint, data, params=None, timeout=None):
+        if endpoint == "/no/search":
+            return deepcopy(state["search"])
+        if endpoint != "/no/content":
+            return None
+        guids = [note["identifier"] for note in data["notes"]]
+        state["bodies"].append(guids)
+        return {"notes": [{"identifier": guid, "content": "body"} for guid in guids]}
+
+    monkeypatch.setattr(notes, "ijson", None)
+    monkeypatch.setattr(NotesService, "_get_json", get_json)
+    monkeypatch.setattr(NotesService, "_post_json", post_json)
+    return state
+
+
+@pytest.fixture
+def streamed(session, server, monkeypatch):
+    """Serve full syncs through the streamed /no/startup path.
+
+    Each queued body is the list of top-level items ijson would yield for it;
+    a TRUNCATED entry ends the body the way a dropped connection does.
+    """
+    bodies = []
+
+    def iter_startup_items(raw):
+        for item in raw.items:
+            if item is TRUNCATED:
+                raise notes.ijson.IncompleteJSONError("premature EOF")
+            yield item
+
+    def get(url, **kwargs):
+        return MagicMock(status_code=200, raw=SimpleNamespace(items=bodies.pop(0)))
+
+    monkeypatch.setattr(notes, "ijson", SimpleNamespace(IncompleteJSONError=ValueError))
+    monkeypatch.setattr(notes, "_iter_startup_items", iter_startup_items)
+    monkeypatch.setattr(notes, "_backoff", lambda delay: 0)
+    session.get.side_effect = get
+    return bodies
+
+
+def startup_items(startup):
+    """Return a /no/startup body as streamed items, one per note."""
+    items = [(key, value) for key, value in startup.items() if key != "notes"]
+    return items + [("notes.item", note) for note in startup["notes"]]
+
+
+def test_disk_cache_is_off_by_default(session, server, tmp_path):
+    """Test that no note contents are written unless asked for."""
+    NotesService(session, SERVICE_ROOT)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disk_cache_round_trip(session, server, tmp_path):
+    """Test that a new instance starts from the saved notes and their token."""
+    NotesService(session, SERVICE_ROOT, disk_cache=True)
+    path = tmp_path / "notes-12345678.json"
+    assert path.exists()
+    if os.name == "posix":
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    service = NotesService(session, SERVICE_ROOT, disk_cache=True)
+    assert server["syncs"] == ["", "1"]
+    assert server["bodies"] == [["N2"]]
+    assert service._notes_by_guid["N1"]["content"] == "<p>milk</p>"
+    assert service._notes_by_guid["N2"]["content"] == "body"
+
+
+def test_incremental_sync(session, server):
+    """Test that a refresh merges only the changes since the last token."""
+    service = NotesService(session, SERVICE_ROOT)
+    assert server["bodies"] == [["N2"]]
+
+    server["startup"]["1"] = {
+        "syncToken": "2",
+        "notes": [
+            {"identifier": "N1", "deleted": True},
+            {
+                "identifier": "N3",
+                "folderName": "Notes",
+                "title": "New",
+                "modified": "2024-01-02T10:00:00Z",
+            },
+        ],
+    }
+    server["startup"]["2"] = {"syncToken": "2", "notes": [], "folders": []}
+    assert service.refresh()
+    assert service.refresh()
+
+    assert server["syncs"] == ["", "1", "2"]
+    assert server["bodies"] == [["N2"], ["N3"]]
+    assert set(service._notes_by_guid) == {"N2", "N3"}
+    assert set(service.lists["Notes"]) == {"N2", "N3"}
+
+
+def test_getters_return_dict_copies(session, server):
+    """Test that the note getters hand out plain dicts, never the cached notes."""
+    service = NotesService(session, SERVICE_ROOT)
+    note = service.get_note("N2")
+    assert type(note) is dict
+    assert (note["body"], note["collection"]) == ("body", "/")
+    note["content"] = "changed"
+    assert "body" not in service._notes_by_guid["N2"]
+    assert service.get_note("N2")["content"] == "body"
+    for notes in (service.notes_in_folder("Notes"), service.search_local("groceries")):
+        assert notes and all(type(note) is dict for note in notes)
+
+
+def test_streamed_startup(session, server, streamed):
+    """Test that a streamed full sync fills the caches like a parsed one."""
+    streamed.append(startup_items(STARTUP))
+    service = NotesService(session, SERVICE_ROOT, max_retries=2)
+    assert server["syncs"] == []
+    assert server["bodies"] == [["N2"]]
+    assert set(service.lists["Notes"]) == {"N1", "N2"}
+    assert service._last_sync_token == "1"
+
+
+def test_truncated_stream_leaves_caches_alone(session, server, streamed):
+    """Test that a body cut short is requested again and never half applied."""
+    streamed.append(startup_items(STARTUP))
+    service = NotesService(session, SERVICE_ROOT, max_retries=2)
+
+    cut = startup_items({**STARTUP, "syncToken": "2", "notes": STARTUP["notes"][:1]})
+    streamed.extend([cut + [TRUNCATED], cut + [TRUNCATED]])
+    with pytest.raises(NonRetryableError):
+        service._sync("")
+    assert set(service.lists["Notes"]) == {"N1", "N2"}
+    assert service._last_sync_token == "1"
+
+    streamed.extend([cut + [TRUNCATED], cut])
+    assert service._sync("")
+    assert set(service.lists["Notes"]) == {"N1"}
+    assert service._last_sync_token == "2"
+    assert streamed == []
+
+
+def test_search_fallback_matches_substring(session, server):
+    """Test that the local fallback matches the whole query, not its words."""
+    service = NotesService(session, SERVICE_ROOT)
+    results = service.search("Foo-Bar")
+    assert [note["guid"] for note in results] == ["N1"]
+    assert isinstance(results[0], dict)
+
+    server["search"] = {"notes": [{"identifier": "N2", "title": "Plans foo and bar"}]}
+    assert [note["guid"] for note in service.search("Foo-Bar")] == ["N2"]
+
+
+def test_search_caches_server_results_only(session, server):
+    """Test that cached server results are handed out as copies."""
+    service = NotesService(session, SERVICE_ROOT)
+    server["search"] = {
+        "notes": [{"identifier": "N1", "title": "Groceries", "tags": ["food"]}]
+    }
+    results = service.search("groceries")
+    results[0]["title"] = "changed"
+    results[0]["tags"].append("changed")
+
+    server["search"] = None
+    again = service.search("groceries")
+    assert again == [{**again[0], "title": "Groceries", "tags": ["food"]}]
+    assert again[0] is not results[0]
+
+
+def test_coalescer_batches_waiting_calls():
+    """Test that calls made during a send go out together in the next batch."""
+    batches = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def send(items):
+        batches.append(sorted(items))
+        if len(batches) == 1:
+            started.set()
+            release.wait(5)
+        return [item * 10 for item in items]
+
+    coalescer = _Coalescer(send)
+    results = {}
+
+    def submit(item):
+        results[item] = coalescer.submit(item)
+
+    threads = [threading.Thread(target=submit, args=(0,))]
+    threads[0].start()
+    started.wait(5)
+    threads += [threading.Thread(target=submit, args=(item,)) for item in (1, 2, 3)]
+    for thread in threads[1:]:
+        thread.start()
+    while len(coalescer._pending) < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert batches == [[0], [1, 2, 3]]
+    assert results == {0: 0, 1: 10, 2: 20, 3: 30}
+
+
+def test_coalescer_error_paths():
+    """Test that a failed send fails its callers and leaves the coalescer usable."""
+    coalescer = _Coalescer(MagicMock(side_effect=ValueError("boom")))
+    with pytest.raises(ValueError):
+        coalescer.submit(1)
+
+    coalescer = _Coalescer(MagicMock(side_effect=KeyboardInterrupt))
+    with pytest.raises(KeyboardInterrupt):
+        coalescer.submit(1)
+    coalescer._send = lambda items: [item * 2 for item in items]
+    assert coalescer.submit(2) == 4
+
+    coalescer = _Coalescer(lambda items: [])
+    with pytest.raises(NonRetryableError):
+        coalescer.submit(1)
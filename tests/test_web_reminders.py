@@ -0,0 +1,133 @@
+"""Web reminders service tests."""
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+import pytz
+
+from pyicloud.services.web_reminders import WebRemindersService, _TokenBucket
+
+SERVICE_ROOT = "https://p123-remindersws.icloud.com"
+
+
+def _due(when):
+    """Format a datetime the way /rd/startup sends due dates."""
+    return [0, when.year, when.month, when.day, when.hour, when.minute]
+
+
+@pytest.fixture
+def now():
+    """Return the current UTC time, truncated to the minute."""
+    return datetime.now(pytz.UTC).replace(second=0, microsecond=0)
+
+
+@pytest.fixture
+def reminders_service(now, monkeypatch):
+    """Create a web reminders service over a canned /rd/startup response."""
+    startup = {
+        "Collections": [
+            {"title": "Home", "guid": "C1", "ctag": "1"},
+            {"title": "Work", "guid": "C2", "ctag": "1"},
+        ],
+        "Reminders": [
+            {
+                "guid": "R1",
+                "pGuid": "C1",
+                "title": "Later",
+                "dueDate": _due(now + timedelta(days=3)),
+            },
+            {
+                "guid": "R2",
+                "pGuid": "C2",
+                "title": "Soon",
+                "dueDate": _due(now + timedelta(days=1)),
+            },
+            {
+                "guid": "R3",
+                "pGuid": "C1",
+                "title": "Past",
+                "dueDate": _due(now - timedelta(days=2)),
+            },
+            {"guid": "R4", "pGuid": "C1", "title": "Undated"},
+        ],
+    }
+    monkeypatch.setattr(
+        WebRemindersService, "_make_request", lambda self, *args, **kwargs: startup
+    )
+    monkeypatch.setattr(
+        WebRemindersService, "_queue_operation", lambda self, *args, **kwargs: True
+    )
+
+    session = MagicMock()
+    session.headers = {}
+    session.retry_strategy = 0
+    session.service.data = {"dsInfo": {"dsid": "12345678"}}
+    session.service.session_data = {"session_token": "fake-session-token"}
+    return WebRemindersService(SERVICE_ROOT, session, {})
+
+
+def test_get_reminders_by_due_date(reminders_service, now):
+    """Test that a date range returns its reminders in due-date order."""
+    reminders = reminders_service.get_reminders_by_due_date(
+        now - timedelta(days=5), now + timedelta(days=5)
+    )
+    assert [reminder["guid"] for reminder in reminders] == ["R3", "R2", "R1"]
+
+    reminders = reminders_service.get_reminders_by_due_date(start_date=now)
+    assert [reminder["guid"] for reminder in reminders] == ["R2", "R1"]
+
+
+def test_upcoming_reminders(reminders_service):
+    """Test that upcoming reminders are grouped by collection."""
+    upcoming = reminders_service.get_upcoming_reminders(days=7)
+    assert {name: [r["guid"] for r in items] for name, items in upcoming.items()} == {
+        "Work": ["R2"],
+        "Home": ["R1"],
+    }
+
+
+def test_views_follow_changes(reminders_service, now):
+    """Test that cached query results are dropped when a reminder changes."""
+    window = (now, now + timedelta(days=5))
+    assert len(reminders_service.get_reminders_by_due_date(*window)) == 2
+    assert len(reminders_service.get_reminders_by_collection("Home")) == 3
+
+    assert reminders_service.complete("R1")
+    assert [
+        r["guid"] for r in reminders_service.get_reminders_by_due_date(*window)
+    ] == ["R2"]
+    assert [
+        r["guid"] for r in reminders_service.get_reminders_by_collection("Home")
+    ] == ["R3", "R4"]
+
+    assert reminders_service.update("R2", due_date=now + timedelta(days=10))
+    assert reminders_service.get_reminders_by_due_date(*window) == []
+
+
+def test_getters_return_dict_copies(reminders_service, now):
+    """Test that the getters hand out plain dicts, never the cached reminders."""
+    reminder = reminders_service.get_reminder("R4")
+    assert type(reminder) is dict
+    assert reminder["title"] == "Undated"
+    assert reminder["due"] is None
+    assert json.loads(json.dumps(reminder))["guid"] == "R4"
+
+    reminder["title"] = "changed"
+    assert reminders_service.get_reminder("R4")["title"] == "Undated"
+    for reminders in (
+        reminders_service.get_reminders_by_collection("Home"),
+        reminders_service.get_reminders_by_due_date(now, now + timedelta(days=5)),
+        *reminders_service.get_upcoming_reminders(days=7).values(),
+    ):
+        assert reminders and all(type(r) is dict for r in reminders)
+
+
+def test_token_bucket_paces_calls(monkeypatch):
+    """Test that the batch rate limiter allows a burst, then spaces calls out."""
+    sleeps = []
+    monkeypatch.setattr("pyicloud.services.web_reminders.time.sleep", sleeps.append)
+    bucket = _TokenBucket(2.0, 2)
+    for _ in range(4):
+        bucket.acquire()
+    assert sleeps == [pytest.approx(0.5, abs=0.05), pytest.approx(1.0, abs=0.05)]